@@ -0,0 +1,202 @@
+from typing import Optional
+
+import argparse
+import asyncio
+import gc
+import time
+import tracemalloc
+
+import discord
+
+from src.configs.gateway import get_gateway_options
+
+
+BENCH_USER_ID = 10 ** 17
+BENCH_GUILD_ID_OFFSET = 10 ** 18
+
+
+def make_user(user_id: int) -> dict:
+    return dict(id=str(user_id), username=f'user{user_id}', discriminator='0', avatar=None, global_name=None)
+
+
+def make_member(user_id: int) -> dict:
+    return dict(
+        user=make_user(user_id),
+        roles=[],
+        joined_at='2024-01-01T00:00:00+00:00',
+        deaf=False,
+        mute=False,
+        flags=0
+    )
+
+
+def make_presence(guild_id: int, user_id: int) -> dict:
+    return dict(
+        user=dict(id=str(user_id)),
+        guild_id=str(guild_id),
+        status='online',
+        client_status=dict(desktop='online'),
+        activities=[dict(name='Some game', type=0, created_at=1700000000000)]
+    )
+
+
+def make_voice_state(guild_id: int, user_id: int, channel_id: Optional[int]) -> dict:
+    return dict(
+        guild_id=str(guild_id),
+        user_id=str(user_id),
+        channel_id=str(channel_id) if channel_id else None,
+        session_id='session',
+        deaf=False,
+        mute=False,
+        self_deaf=False,
+        self_mute=False,
+        self_video=False,
+        suppress=False,
+        request_to_speak_timestamp=None
+    )
+
+
+def make_message(guild_id: int, channel_id: int, user_id: int, message_id: int) -> dict:
+    member = make_member(user_id)
+    member.pop('user')
+
+    return dict(
+        id=str(message_id),
+        channel_id=str(channel_id),
+        guild_id=str(guild_id),
+        author=make_user(user_id),
+        member=member,
+        content='Some chat message that the music bot never reads',
+        timestamp='2024-01-01T00:00:00+00:00',
+        edited_timestamp=None,
+        tts=False,
+        mention_everyone=False,
+        mentions=[],
+        mention_roles=[],
+        attachments=[],
+        embeds=[],
+        pinned=False,
+        type=0
+    )
+
+
+def make_guild(guild_id: int, members: int, voice_members: int, intents: discord.Intents) -> dict:
+    text_channel_id, voice_channel_id = guild_id + 1, guild_id + 2
+    user_ids = range(BENCH_USER_ID + 1, BENCH_USER_ID + members + 1)
+    voice_user_ids = set(user_ids[:voice_members])
+
+    return dict(
+        id=str(guild_id),
+        name=f'guild{guild_id}',
+        owner_id=str(BENCH_USER_ID + 1),
+        roles=[dict(
+            id=str(guild_id), name='@everyone', permissions='0', position=0,
+            color=0, hoist=False, managed=False, mentionable=False
+        )],
+        emojis=[],
+        stickers=[],
+        features=[],
+        channels=[
+            dict(id=str(text_channel_id), type=0, name='music', position=0, permission_overwrites=[]),
+            dict(id=str(voice_channel_id), type=2, name='voice', position=1, permission_overwrites=[],
+                 bitrate=64000, user_limit=0)
+        ],
+        threads=[],
+        stage_instances=[],
+        guild_scheduled_events=[],
+        voice_states=[make_voice_state(guild_id, user_id, voice_channel_id) for user_id in voice_user_ids],
+        members=[
+            make_member(user_id)
+            for user_id in user_ids
+            if intents.members or user_id in voice_user_ids
+        ],
+        presences=[make_presence(guild_id, user_id) for user_id in user_ids] if intents.presences else [],
+        member_count=members,
+        large=members > 250
+    )
+
+
+def make_events(guild_id: int, members: int, events: int, intents: discord.Intents) -> list:
+    text_channel_id, voice_channel_id = guild_id + 1, guild_id + 2
+
+    stream = []
+    for i in range(events):
+        user_id = BENCH_USER_ID + 1 + i % members
+        kind = i % 10
+        if kind == 0:
+            voice_state = make_voice_state(guild_id, user_id, voice_channel_id if i % 20 else None)
+            voice_state['member'] = make_member(user_id)
+            stream.append(('VOICE_STATE_UPDATE', voice_state))
+        elif kind < 7:
+            if intents.presences:
+                stream.append(('PRESENCE_UPDATE', make_presence(guild_id, user_id)))
+        elif intents.guild_messages:
+            stream.append(('MESSAGE_CREATE', make_message(guild_id, text_channel_id, user_id, 10 ** 18 + i)))
+
+    return stream
+
+
+async def measure(profile: str, guilds: int, members: int, voice_members: int, events: int) -> None:
+    options = get_gateway_options(profile)
+    intents = options['intents']
+
+    payloads = [
+        make_guild(BENCH_GUILD_ID_OFFSET + guild * 10, members, voice_members, intents)
+        for guild in range(guilds)
+    ]
+    streams = [
+        make_events(BENCH_GUILD_ID_OFFSET + guild * 10, members, events, intents)
+        for guild in range(guilds)
+    ]
+
+    gc.collect()
+    tracemalloc.start()
+
+    client = discord.Client(**{**options, 'chunk_guilds_at_startup': False})
+    state = client._connection
+    state.user = discord.ClientUser(state=state, data=make_user(BENCH_USER_ID))
+
+    started, cpu_started = time.perf_counter(), time.process_time()
+
+    for payload in payloads:
+        state.parsers['GUILD_CREATE'](payload)
+
+    delivered = 0
+    for stream in streams:
+        for event, data in stream:
+            state.parsers[event](data)
+            delivered += 1
+
+    elapsed, cpu_time = time.perf_counter() - started, time.process_time() - cpu_started
+
+    payloads.clear()
+    streams.clear()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    cached_members = sum(len(guild.members) for guild in client.guilds)
+
+    print(
+        f'{profile:<5} events={delivered:<8} cached_members={cached_members:<8} '
+        f'time={elapsed:7.3f}s cpu={cpu_time:7.3f}s '
+        f'retained={current / 2 ** 20:8.1f}MiB peak_memory={peak / 2 ** 20:8.1f}MiB'
+    )
+
+    await client.close()
+
+
+async def main(guilds: int, members: int, voice_members: int, events: int) -> None:
+    for profile in ('full', 'lean'):
+        await measure(profile, guilds, members, voice_members, events)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare gateway cache memory and event load of the gateway profiles')
+    parser.add_argument('--guilds', type=int, default=10)
+    parser.add_argument('--members', type=int, default=10_000)
+    parser.add_argument('--voice-members', type=int, default=20)
+    parser.add_argument('--events', type=int, default=20_000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.guilds, args.members, args.voice_members, args.events))
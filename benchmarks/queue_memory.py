@@ -0,0 +1,79 @@
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+import lavalink
+
+from src.configs.lavalink import QueueEntry
+
+
+def build_playlist(entries: int) -> str:
+    tracks = []
+    for i in range(entries):
+        info = dict(
+            identifier=f'{i:011d}',
+            isSeekable=True,
+            author=f'Artist {i % 500}',
+            length=180000 + i % 60000,
+            isStream=False,
+            position=0,
+            title=f'Track title number {i}',
+            uri=f'https://www.youtube.com/watch?v={i:011d}',
+            artworkUrl=f'https://i.ytimg.com/vi/{i:011d}/mqdefault.jpg',
+            isrc=None,
+            sourceName='youtube'
+        )
+        tracks.append(dict(encoded=lavalink.encode_track(info)[1], info=info, pluginInfo={}, userData={}))
+
+    return json.dumps(tracks)
+
+
+def load_audio_tracks(playlist: str, requesters: int) -> list:
+    return [
+        lavalink.AudioTrack(track, f'requester-{i % requesters}')
+        for i, track in enumerate(json.loads(playlist))
+    ]
+
+
+def load_queue_entries(playlist: str, requesters: int) -> list:
+    return [
+        QueueEntry.from_track(lavalink.AudioTrack(track, f'requester-{i % requesters}'))
+        for i, track in enumerate(json.loads(playlist))
+    ]
+
+
+def measure(name: str, loader, playlist: str, requesters: int) -> None:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+
+    queue = loader(playlist, requesters)
+
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f'{name:<7} entries={len(queue):<8} time={elapsed:7.3f}s '
+        f'retained={current / 2 ** 20:8.1f}MiB per_entry={current / len(queue):7.0f}B '
+        f'peak_memory={peak / 2 ** 20:8.1f}MiB'
+    )
+
+
+def main(entries: int, requesters: int) -> None:
+    playlist = build_playlist(entries)
+
+    measure('tracks', load_audio_tracks, playlist, requesters)
+    measure('entries', load_queue_entries, playlist, requesters)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare memory of queued AudioTracks against QueueEntries')
+    parser.add_argument('--entries', type=int, default=100_000)
+    parser.add_argument('--requesters', type=int, default=50)
+    args = parser.parse_args()
+
+    main(args.entries, args.requesters)
@@ -0,0 +1,87 @@
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import selectinload
+
+from src.configs.logger import Logger
+from src.configs.postgres import async_engine, get_async_session
+from src.migrations import migrate
+from src.models import GuildModel
+
+
+BENCH_GUILD_ID_OFFSET = -10 ** 12
+
+
+async def seed(guilds: int, history: int) -> None:
+    await migrate(Logger())
+
+    async with async_engine.begin() as connection:
+        await connection.execute(text(
+            'INSERT INTO guild (guild_id, channel_id, player_message_id, queue_message_id) '
+            'SELECT :offset - g, g, g, g FROM generate_series(1, :guilds) AS g'
+        ), dict(offset=BENCH_GUILD_ID_OFFSET, guilds=guilds))
+
+        await connection.execute(text(
+            'INSERT INTO history (guild_id, author, title, uri) '
+            'SELECT :offset - (h % :guilds + 1), \'author\', \'title\', \'https://youtu.be/\' || h '
+            'FROM generate_series(1, :history) AS h'
+        ), dict(offset=BENCH_GUILD_ID_OFFSET, guilds=guilds, history=history))
+
+
+async def cleanup() -> None:
+    async with async_engine.begin() as connection:
+        await connection.execute(
+            text('DELETE FROM guild WHERE guild_id <= :offset'),
+            dict(offset=BENCH_GUILD_ID_OFFSET)
+        )
+
+
+async def load_eager() -> int:
+    async with get_async_session() as session:
+        query = (
+            select(GuildModel)
+            .options(selectinload(GuildModel.guild_history))
+        )
+
+        return len((await session.execute(query)).scalars().all())
+
+
+async def load_lean() -> int:
+    GuildModel.invalidate()
+
+    return len(await GuildModel.get_all())
+
+
+async def measure(name: str, loader) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+
+    count = await loader()
+
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f'{name:<6} guilds={count:<8} time={elapsed:8.3f}s peak_memory={peak / 2 ** 20:9.1f}MiB')
+
+
+async def main(guilds: int, history: int) -> None:
+    await seed(guilds, history)
+    try:
+        await measure('eager', load_eager)
+        await measure('lean', load_lean)
+    finally:
+        await cleanup()
+        await async_engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare startup guild loading against a large history table')
+    parser.add_argument('--guilds', type=int, default=1000)
+    parser.add_argument('--history', type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.guilds, args.history))
@@ -0,0 +1,72 @@
+from typing import List
+
+import asyncio
+import multiprocessing
+import sys
+
+import discord
+
+from src.configs.environment import get_environment_variables
+from src.configs.logger import Logger
+
+
+env = get_environment_variables()
+
+
+async def get_shard_count(token: str) -> int:
+    http = discord.http.HTTPClient(asyncio.get_running_loop())
+    try:
+        await http.static_login(token)
+        shard_count, _ = await http.get_bot_gateway()
+    finally:
+        await http.close()
+
+    return shard_count
+
+
+def get_cluster_shard_ids(cluster_id: int, cluster_count: int, shard_count: int) -> List[int]:
+    start = shard_count * cluster_id // cluster_count
+    end = shard_count * (cluster_id + 1) // cluster_count
+
+    return list(range(start, end))
+
+
+def run_cluster(cluster_id: int, shard_ids: List[int], shard_count: int) -> None:
+    from src.bot import Bot
+
+    Bot(env.BOT_TOKEN, shard_ids=shard_ids, shard_count=shard_count, cluster_id=cluster_id)
+
+
+if __name__ == '__main__':
+    logger = Logger()
+
+    shard_count = env.BOT_SHARD_COUNT or asyncio.run(get_shard_count(env.BOT_TOKEN))
+    cluster_count = max(min(env.BOT_CLUSTER_COUNT, shard_count), 1)
+    cluster_ids = env.BOT_CLUSTER_IDS or list(range(cluster_count))
+
+    invalid_cluster_ids = [cluster_id for cluster_id in cluster_ids if not 0 <= cluster_id < cluster_count]
+    if invalid_cluster_ids:
+        logger.error(
+            f'BOT_CLUSTER_IDS {invalid_cluster_ids} are out of range: there are {cluster_count} clusters '
+            f'(BOT_CLUSTER_COUNT={env.BOT_CLUSTER_COUNT}, {shard_count} shards), valid ids are 0-{cluster_count - 1}.'
+        )
+        sys.exit(1)
+
+    processes = []
+    for cluster_id in cluster_ids:
+        shard_ids = get_cluster_shard_ids(cluster_id, cluster_count, shard_count)
+
+        process = multiprocessing.Process(
+            target=run_cluster,
+            args=(cluster_id, shard_ids, shard_count),
+            name=f'{env.BOT_TITLE}-{cluster_id}'
+        )
+        process.start()
+        processes.append(process)
+
+        logger.info(f'Started cluster {cluster_id} with shards {shard_ids[0]}-{shard_ids[-1]} of {shard_count}.')
+
+    for process in processes:
+        process.join()
+        if process.exitcode:
+            logger.error(f'Cluster {process.name} exited with code {process.exitcode}.')
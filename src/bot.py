@@ -1,24 +1,45 @@
+from typing import Dict, List, Optional
+
+import hashlib
+import json
+
 import discord
 import lavalink
 from discord.ext import commands
 
 from src.cogs import Music
-from src.configs.lavalink import LavalinkClient
+from src.configs.environment import get_environment_variables
+from src.configs.gateway import get_gateway_options
+from src.configs.lavalink import LavalinkClient, get_node_settings, get_session_key
 from src.configs.logger import Logger
-from src.configs.postgres import async_engine
-from src.models import BaseModel
+from src.migrations import migrate
+from src.models import StateModel
+
+
+env = get_environment_variables()
 
 
-class Bot(commands.Bot):
-    def __init__(self, token: str):
+class Bot(commands.AutoShardedBot):
+    def __init__(
+        self,
+        token: str,
+        shard_ids: Optional[List[int]] = None,
+        shard_count: Optional[int] = None,
+        cluster_id: int = 0
+    ):
         super().__init__(
             command_prefix=commands.when_mentioned_or(),
-            intents=discord.Intents.all()
+            shard_ids=shard_ids,
+            shard_count=shard_count,
+            **get_gateway_options(env.BOT_GATEWAY_PROFILE)
         )
 
         self.lavalink: lavalink.Client = None
 
-        self.logger = Logger()
+        self.cluster_id = cluster_id
+        self.commands_synced = False
+
+        self.logger = Logger(f'{env.BOT_TITLE}-{cluster_id}' if shard_ids is not None else None)
         self.logger_handler = self.logger.handlers[0]
 
         self.run(
@@ -27,10 +48,9 @@ class Bot(commands.Bot):
             log_formatter=self.logger_handler.formatter
         )
 
-    @staticmethod
-    async def init_db():
-        async with async_engine.begin() as connection:
-            await connection.run_sync(BaseModel.metadata.create_all)
+    @property
+    def clustered(self) -> bool:
+        return self.shard_ids is not None
 
     @staticmethod
     def user_is_administrator(user: discord.Member) -> bool:
@@ -40,17 +60,54 @@ class Bot(commands.Bot):
     def is_user_connected(user: discord.Member) -> bool:
         return user.voice is not None
 
-    async def on_connect(self) -> None:
-        await self.init_db()
+    async def setup_hook(self) -> None:
+        await migrate(self.logger)
 
     async def on_ready(self) -> None:
         await self.wait_until_ready()
 
-        self.lavalink = LavalinkClient(self).lavalink
+        if self.lavalink is None:
+            self.lavalink = LavalinkClient(self, await self.load_lavalink_sessions()).lavalink
+
+        if self.get_cog(Music.__cog_name__) is None:
+            await self.add_cog(Music(self))
+
+        if self.cluster_id == 0 and not self.commands_synced:
+            await self.sync_commands()
+
+    async def load_lavalink_sessions(self) -> Dict[str, str]:
+        session_ids: Dict[str, str] = {}
+        for node in get_node_settings():
+            session_id = await StateModel.get(get_session_key(self.user.id, self.cluster_id, node.name))
+            if session_id:
+                session_ids[node.name] = session_id
+
+        return session_ids
+
+    async def save_lavalink_session(self, node: lavalink.Node, session_id: str) -> None:
+        await StateModel.set(get_session_key(self.user.id, self.cluster_id, node.name), session_id)
+
+    def get_command_tree_fingerprint(self) -> str:
+        commands = sorted(
+            (command.to_dict() for command in self.tree.get_commands()),
+            key=lambda command: command['name']
+        )
+
+        return hashlib.sha256(json.dumps(commands, sort_keys=True).encode()).hexdigest()
+
+    async def sync_commands(self) -> None:
+        key = f'command_tree_fingerprint:{self.application_id}'
+
+        fingerprint = self.get_command_tree_fingerprint()
+        if await StateModel.get(key) == fingerprint:
+            self.logger.debug('Application commands are up to date, skipping sync.')
+        else:
+            await self.tree.sync()
+            await StateModel.set(key, fingerprint)
 
-        await self.add_cog(Music(self))
+            self.logger.info(f'Synced {len(self.tree.get_commands())} application commands.')
 
-        await self.tree.sync()
+        self.commands_synced = True
 
     def is_user_with_bot(self, user: discord.Member) -> bool:
         voice_client = user.guild.voice_client
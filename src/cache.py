@@ -0,0 +1,52 @@
+from typing import Generic, Optional, TypeVar
+
+from collections import OrderedDict
+
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class LRUCache(Generic[K, V]):
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+
+        self.hits = 0
+        self.misses = 0
+
+        self._items: 'OrderedDict[K, V]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: K) -> Optional[V]:
+        value = self.lookup(key)
+        self.record(value is not None)
+
+        return value
+
+    def lookup(self, key: K) -> Optional[V]:
+        value = self._items.get(key)
+        if value is not None:
+            self._items.move_to_end(key)
+
+        return value
+
+    def record(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def set(self, key: K, value: V) -> None:
+        self._items[key] = value
+        self._items.move_to_end(key)
+
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def invalidate(self, key: Optional[K] = None) -> None:
+        if key is None:
+            self._items.clear()
+        else:
+            self._items.pop(key, None)
@@ -1,23 +1,43 @@
-from typing import List, TYPE_CHECKING
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
 if TYPE_CHECKING:
     from src.bot import Bot
 
+import asyncio
+import time
+
 import discord
 import lavalink
 import validators
 from discord.ext import commands
 
 from src import utils
+from src.cache import LRUCache
+from src.render import RateLimiter, message_fingerprints, render_scheduler
+from src.search import track_search
 from src.configs.environment import get_environment_variables
+from src.configs.postgres import pool_metrics
 from src.configs.lavalink import (
     LavalinkVoiceClient,
-    LavalinkPlayer
+    LavalinkPlayer,
+    QueueEntry,
+    decode_track,
+    find_ideal_node,
+    get_load_score,
+    get_playing_counts
 )
 from src.configs.language import Emoji, get_application_language
 from src.models import (
     GuildModel,
-    HistoryModel
+    HistoryModel,
+    HistoryPage,
+    HistoryCursor,
+    QueueSnapshot,
+    history_buffer,
+    history_pruner,
+    queue_store
 )
+from src.models.guild import guild_cache
+from src.models.history import history_pages
 
 
 env = get_environment_variables()
@@ -36,36 +56,197 @@ class Music(commands.Cog):
         self.lavalink_node_ready = False
         self.lavalink.add_event_hooks(self)
 
-    @lavalink.listener()
-    async def on_node_ready(self, _event: lavalink.NodeReadyEvent):
+        self.missing_guild_ids: Set[int] = set()
+        self.cleanup_task: Optional[asyncio.Task] = None
+        self.idle_task: Optional[asyncio.Task] = None
+        self.stats_task: Optional[asyncio.Task] = None
+
+        self.voice_occupancy: Dict[int, int] = {}
+
+        self.nothing_play_view = NothingPlayView(self)
+        self.play_now_view = PlayNowView(self)
+        self.queue_view = QueueView(self)
+
+    async def cog_load(self) -> None:
+        track_search.logger = self.logger
+        render_scheduler.logger = self.logger
+
+        self.bot.add_view(self.play_now_view)
+        self.bot.add_view(self.queue_view)
+
+        history_buffer.start(self.logger)
+        if self.bot.cluster_id == 0:
+            history_pruner.start(self.logger)
+        queue_store.start(self.logger)
+
+        self.idle_task = asyncio.create_task(self.reap_idle_players())
+        if env.BOT_STATS_INTERVAL > 0:
+            self.stats_task = asyncio.create_task(self.log_stats())
+
+    async def cog_unload(self) -> None:
+        if self.cleanup_task is not None:
+            self.cleanup_task.cancel()
+        if self.idle_task is not None:
+            self.idle_task.cancel()
+        if self.stats_task is not None:
+            self.stats_task.cancel()
+
+        for player in self.lavalink.player_manager.values():
+            queue_store.mark(player)
+
+        await render_scheduler.close()
+        await queue_store.close()
+        await history_pruner.close()
+        await history_buffer.close()
+
+    @lavalink.listener(lavalink.NodeReadyEvent)
+    async def on_node_ready(self, event: lavalink.NodeReadyEvent):
+        await self.enable_resuming(event)
+
+        resumed_players = await self.get_resumed_players(event)
+
         if self.lavalink_node_ready:
+            await self.reattach_players(event.node, resumed_players)
             return
 
         self.lavalink_node_ready = True
 
-        guild_models = await GuildModel.get_all()
-        for guild_model in guild_models:
-            player: LavalinkPlayer = await self.create_player(guild_model)
+        started = time.perf_counter()
+        if self.bot.clustered:
+            shard_ids, shard_count = self.bot.shard_ids, self.bot.shard_count
+        else:
+            shard_ids, shard_count = None, None
 
-            player_message_id = await NothingPlayEmbed.update(self, player.guild_id)
-            self.bot.add_view(
-                view=NothingPlayView(self, player.guild_id),
-                message_id=player_message_id
-            )
-            self.bot.add_view(
-                view=PlayNowView(self, player.guild_id),
-                message_id=player_message_id
-            )
+        guild_models = await GuildModel.get_all(shard_ids, shard_count)
+        snapshots = await queue_store.load(shard_ids, shard_count)
+        load_time = time.perf_counter() - started
 
-            queue_message_id = await QueueEmbed.update(self, player.guild_id)
-            self.bot.add_view(
-                view=QueueView(player.guild_id),
-                message_id=queue_message_id
-            )
+        started = time.perf_counter()
+        missing_guild_ids = await self.restore_guilds(guild_models, snapshots, event.node, resumed_players)
+        restore_time = time.perf_counter() - started
+
+        await self.destroy_remote_players(event.node, resumed_players)
+
+        started = time.perf_counter()
+        if missing_guild_ids:
+            await self.cleanup_guilds(missing_guild_ids)
+        cleanup_time = time.perf_counter() - started
 
-        self.logger.info(f'Ready to play on {len(guild_models)} servers.')
+        self.logger.info(
+            f'Restored {len(guild_models) - len(missing_guild_ids)} servers '
+            f'(load: {load_time:.2f}s, restore: {restore_time:.2f}s, '
+            f'cleanup of {len(missing_guild_ids)} servers: {cleanup_time:.2f}s).'
+        )
+        self.logger.info(
+            f'Ready to play on {len(guild_models) - len(missing_guild_ids)} servers '
+            f'(shards: {", ".join(map(str, sorted(self.bot.shards)))} of {self.bot.shard_count}).'
+        )
 
-    async def create_player(self, guild_model: GuildModel) -> LavalinkPlayer:
+    async def restore_guilds(
+        self,
+        guild_models: List[GuildModel],
+        snapshots: Dict[int, QueueSnapshot],
+        node: Optional[lavalink.Node] = None,
+        resumed_players: Optional[Dict[int, dict]] = None
+    ) -> List[int]:
+        resumed_players = resumed_players if resumed_players is not None else {}
+
+        semaphore = asyncio.Semaphore(max(env.BOT_RESTORE_CONCURRENCY, 1))
+        rate_limiter = RateLimiter(env.BOT_RESTORE_RATE)
+
+        missing_guild_ids: List[int] = []
+        phase_times = dict(messages=0.0, players=0.0)
+        resumed = 0
+        progress_step = max(len(guild_models) // 10, 1)
+        restored = 0
+
+        async def restore_guild(guild_model: GuildModel) -> None:
+            nonlocal restored, resumed
+
+            guild_id = guild_model.guild_id
+
+            async with semaphore:
+                try:
+                    started = time.perf_counter()
+
+                    await rate_limiter.acquire()
+                    await NothingPlayEmbed.update(self, guild_id)
+
+                    await rate_limiter.acquire()
+                    await QueueEmbed.update(self, guild_id)
+
+                    phase_times['messages'] += time.perf_counter() - started
+                    started = time.perf_counter()
+
+                    snapshot = snapshots.get(guild_id)
+                    raw_player = resumed_players.get(guild_id)
+                    if raw_player is not None and await self.resume_player(guild_model, node, raw_player, snapshot):
+                        del resumed_players[guild_id]
+                        resumed += 1
+                    elif snapshot is not None:
+                        player: LavalinkPlayer = await self.create_player(guild_model, snapshot)
+                        if player.queue:
+                            self.render_queue(guild_id)
+
+                    phase_times['players'] += time.perf_counter() - started
+                except PlayerEntityNotFound:
+                    missing_guild_ids.append(guild_id)
+                except Exception as error:
+                    self.logger.warning(f'Failed to restore server {guild_id}: {error}')
+
+            restored += 1
+            if restored % progress_step == 0 or restored == len(guild_models):
+                self.logger.info(f'Restored {restored}/{len(guild_models)} servers.')
+
+        await asyncio.gather(*(restore_guild(guild_model) for guild_model in guild_models))
+
+        self.logger.debug(
+            f'Spent {phase_times["messages"]:.2f}s on messages and '
+            f'{phase_times["players"]:.2f}s on players across all servers.'
+        )
+        if resumed:
+            self.logger.info(f'Reattached {resumed} players still playing on node {node.name}.')
+
+        return missing_guild_ids
+
+    async def cleanup_guilds(self, guild_ids: List[int]) -> None:
+        for guild_id in guild_ids:
+            if self.lavalink.player_manager.get(guild_id) is not None:
+                try:
+                    await self.lavalink.player_manager.destroy(guild_id)
+                except Exception as error:
+                    self.logger.warning(f'Failed to destroy player {guild_id}: {error}')
+
+            render_scheduler.cancel(guild_id)
+            message_fingerprints.forget(guild_id)
+            queue_pages.invalidate(guild_id)
+            queue_store.forget(guild_id)
+
+        await GuildModel.delete_many(guild_ids)
+
+        self.logger.info(f'Removed {len(guild_ids)} servers whose player channel or messages are gone.')
+
+    def report_missing_guild(self, guild_id: int) -> None:
+        self.missing_guild_ids.add(guild_id)
+
+        if self.cleanup_task is None:
+            self.cleanup_task = asyncio.create_task(self.cleanup_missing_guilds())
+
+    async def cleanup_missing_guilds(self) -> None:
+        try:
+            await asyncio.sleep(env.BOT_RENDER_INTERVAL)
+
+            guild_ids, self.missing_guild_ids = list(self.missing_guild_ids), set()
+            await self.cleanup_guilds(guild_ids)
+        finally:
+            self.cleanup_task = None
+
+    async def create_player(
+        self,
+        guild_model: GuildModel,
+        snapshot: Optional[QueueSnapshot] = None,
+        node: Optional[lavalink.Node] = None
+    ) -> LavalinkPlayer:
         channel = self.bot.get_channel(guild_model.channel_id)
         if channel:
             player_message = channel.get_partial_message(guild_model.player_message_id)
@@ -78,41 +259,298 @@ class Music(commands.Cog):
         else:
             raise PlayerChannelNotFound(self.bot, guild_model.guild_id)
 
-        player: LavalinkPlayer = self.lavalink.player_manager.create(guild_model.guild_id)
+        player: LavalinkPlayer = self.lavalink.player_manager.create(
+            guild_model.guild_id,
+            node=node or find_ideal_node(self.lavalink, env.LL_REGION)
+        )
 
         player.bot = self.bot
+        player.idle_since = time.monotonic()
 
         guild = self.bot.get_guild(guild_model.guild_id)
         self.logger.debug(f'[{guild.name}] - Create player on the server.')
 
+        if snapshot is not None:
+            await self.restore_queue(player, snapshot)
+
+        return player
+
+    async def enable_resuming(self, event: lavalink.NodeReadyEvent) -> None:
+        try:
+            await self.bot.save_lavalink_session(event.node, event.session_id)
+            await event.node.update_session(resuming=True, timeout=env.LL_RESUME_TIMEOUT)
+        except Exception as error:
+            self.logger.warning(f'Failed to enable session resuming on node {event.node.name}: {error}')
+            return
+
+        self.logger.debug(
+            f'Node {event.node.name} session {event.session_id} '
+            f'({"resumed" if event.resumed else "new"}) is kept for {env.LL_RESUME_TIMEOUT}s after disconnect.'
+        )
+
+    async def get_resumed_players(self, event: lavalink.NodeReadyEvent) -> Dict[int, dict]:
+        if not event.resumed:
+            return {}
+
+        try:
+            raw_players = await event.node.get_players()
+        except Exception as error:
+            self.logger.warning(f'Failed to fetch players of resumed node {event.node.name}: {error}')
+            return {}
+
+        return {int(raw_player['guildId']): raw_player for raw_player in raw_players}
+
+    async def resume_player(
+        self,
+        guild_model: GuildModel,
+        node: lavalink.Node,
+        raw_player: dict,
+        snapshot: Optional[QueueSnapshot] = None
+    ) -> bool:
+        guild = self.bot.get_guild(guild_model.guild_id)
+        if not guild or not raw_player.get('track'):
+            return False
+
+        if guild.me and guild.me.voice and guild.me.voice.channel:
+            voice_channel = guild.me.voice.channel
+        elif snapshot is not None and snapshot.voice_channel_id:
+            voice_channel = self.bot.get_channel(snapshot.voice_channel_id)
+        else:
+            voice_channel = None
+        if voice_channel is None:
+            return False
+
+        player: LavalinkPlayer = await self.create_player(guild_model, node=node)
+
+        if snapshot is not None:
+            self.fill_queue(player, snapshot)
+
+        encoded = raw_player['track']['encoded']
+        requester = snapshot.requester if snapshot is not None and snapshot.track == encoded else None
+
+        player.current = player.last = decode_track(encoded, requester)
+        player.paused = raw_player.get('paused', False)
+        player.volume = raw_player.get('volume', player.volume)
+        player.idle_since = None
+        await player.update_state(raw_player.get('state', {}))
+
+        await voice_channel.connect(cls=LavalinkVoiceClient)
+
+        queue_store.mark(player)
+
+        self.render_player(player.guild_id, player.current)
+        if player.queue:
+            self.render_queue(player.guild_id)
+
+        self.logger.debug(
+            f'[{guild.name}] - Reattached to the player on node {node.name} '
+            f'({player.current.author} - {player.current.title} [{player.current.uri}]) on the server.'
+        )
+
+        return True
+
+    async def reattach_players(self, node: lavalink.Node, resumed_players: Dict[int, dict]) -> None:
+        for guild_id in list(resumed_players):
+            if self.lavalink.player_manager.get(guild_id) is not None:
+                continue
+
+            try:
+                guild_model = await GuildModel.get(guild_id)
+                if guild_model is not None and await self.resume_player(guild_model, node, resumed_players[guild_id]):
+                    del resumed_players[guild_id]
+            except PlayerEntityNotFound:
+                self.report_missing_guild(guild_id)
+            except Exception as error:
+                self.logger.warning(f'Failed to reattach player {guild_id} on node {node.name}: {error}')
+
+        await self.destroy_remote_players(node, resumed_players)
+
+    async def destroy_remote_players(self, node: lavalink.Node, resumed_players: Dict[int, dict]) -> None:
+        destroyed = 0
+        for guild_id in resumed_players:
+            player: LavalinkPlayer = self.lavalink.player_manager.get(guild_id)
+            if player is not None and player.node is node:
+                continue
+
+            try:
+                await node.destroy_player(guild_id)
+                destroyed += 1
+            except Exception as error:
+                self.logger.warning(f'Failed to destroy stale player {guild_id} on node {node.name}: {error}')
+
+        if destroyed:
+            self.logger.debug(f'Destroyed {destroyed} stale players resumed on node {node.name}.')
+
+    async def get_player(self, guild_id: int) -> Optional[LavalinkPlayer]:
+        player: LavalinkPlayer = self.lavalink.player_manager.get(guild_id)
+        if player is None:
+            guild_model = await GuildModel.get(guild_id)
+            if guild_model is None:
+                return None
+
+            player = await self.create_player(guild_model)
+
         return player
 
+    async def reap_idle_players(self) -> None:
+        while True:
+            await asyncio.sleep(env.BOT_IDLE_CHECK_INTERVAL)
+
+            now = time.monotonic()
+            destroyed = 0
+            for player in list(self.lavalink.player_manager.values()):
+                player: LavalinkPlayer
+                if player.is_playing:
+                    player.idle_since = None
+                    continue
+
+                if player.idle_since is None:
+                    player.idle_since = now
+                    continue
+
+                idle_time = now - player.idle_since
+                guild = self.bot.get_guild(player.guild_id)
+
+                try:
+                    if guild and guild.voice_client and idle_time >= env.BOT_IDLE_DISCONNECT_TIMEOUT:
+                        await guild.voice_client.disconnect(force=True)
+
+                        self.logger.debug(f'[{guild.name}] - Disconnected idle player on the server.')
+                    elif not player.queue and not player.is_connected and idle_time >= env.BOT_IDLE_DESTROY_TIMEOUT:
+                        await self.lavalink.player_manager.destroy(player.guild_id)
+                        destroyed += 1
+                except Exception as error:
+                    self.logger.warning(f'Failed to evict idle player {player.guild_id}: {error}')
+
+            if destroyed:
+                self.logger.info(
+                    f'Destroyed {destroyed} idle players, {len(self.lavalink.player_manager.players)} left.'
+                )
+
+    async def log_stats(self) -> None:
+        while True:
+            await asyncio.sleep(env.BOT_STATS_INTERVAL)
+
+            self.logger.info(f'Database pool: {pool_metrics}.')
+            self.logger.info(
+                f'Caches: guilds {guild_cache.hits}/{guild_cache.hits + guild_cache.misses} hits, '
+                f'history pages {history_pages.hits}/{history_pages.hits + history_pages.misses} hits, '
+                f'queue pages {queue_pages.hits}/{queue_pages.hits + queue_pages.misses} hits, '
+                f'track search {track_search.hit_ratio:.0%} hit ratio '
+                f'({track_search.coalesced} lookups coalesced).'
+            )
+            self.logger.info(
+                f'Players: {len(self.lavalink.player_manager.players)}, '
+                f'renders: {render_scheduler.rendered}/{render_scheduler.scheduled} '
+                f'({render_scheduler.coalesced} coalesced), '
+                f'message edits: {message_fingerprints.sent} sent, '
+                f'{message_fingerprints.skipped} skipped as unchanged.'
+            )
+
+    @staticmethod
+    def fill_queue(player: LavalinkPlayer, snapshot: QueueSnapshot) -> None:
+        for seq, encoded, requester in snapshot.queue:
+            player.add(QueueEntry.from_encoded(encoded, requester, seq))
+
+    async def restore_queue(self, player: LavalinkPlayer, snapshot: QueueSnapshot) -> None:
+        self.fill_queue(player, snapshot)
+
+        if snapshot.track:
+            track = decode_track(snapshot.track, snapshot.requester)
+
+            voice_channel = self.bot.get_channel(snapshot.voice_channel_id) if snapshot.voice_channel_id else None
+            if voice_channel and any(not member.bot for member in voice_channel.members):
+                await voice_channel.connect(cls=LavalinkVoiceClient)
+                await player.play(
+                    track,
+                    start_time=snapshot.position if 0 <= snapshot.position < track.duration else 0
+                )
+            else:
+                player.add(track, index=0)
+
+        queue_store.mark(player)
+
+        guild = self.bot.get_guild(player.guild_id)
+        self.logger.debug(f'[{guild.name}] - Restored {len(player.queue)} queued tracks on the server.')
+
+    async def place_player(self, player: LavalinkPlayer, voice_channel: discord.VoiceChannel) -> None:
+        region = (
+            self.lavalink.node_manager.get_region(voice_channel.rtc_region)
+            or player.endpoint_region
+            or env.LL_REGION
+        )
+
+        node = find_ideal_node(self.lavalink, region)
+        if not node or node is player.node:
+            return
+
+        playing_counts = get_playing_counts(self.lavalink)
+        if player.node.region == node.region:
+            if get_load_score(player.node, playing_counts) <= get_load_score(node, playing_counts):
+                return
+
+        await player.change_node(node)
+
+        guild = self.bot.get_guild(player.guild_id)
+        self.logger.debug(f'[{guild.name}] - Moved player to node {node.name} ({region}).')
+
     async def add_to_queue(
         self,
         guild_id: int,
         voice_channel: discord.VoiceChannel,
         tracks: List[lavalink.AudioTrack],
         requester: str
-    ):
-        player: LavalinkPlayer = self.lavalink.player_manager.get(guild_id)
+    ) -> int:
+        player = await self.get_player(guild_id)
+        guild = self.bot.get_guild(player.guild_id)
 
-        for track in tracks:
-            player.add(track, requester=requester)
+        dropped = 0
+        if env.BOT_QUEUE_MAX_SIZE:
+            remaining = max(env.BOT_QUEUE_MAX_SIZE - len(player.queue), 0)
+            tracks, dropped = tracks[:remaining], max(len(tracks) - remaining, 0)
+
+        if dropped:
+            self.logger.info(
+                f'[{guild.name}] - Queue limit of {env.BOT_QUEUE_MAX_SIZE} tracks reached, '
+                f'{dropped} tracks were not added on the server.'
+            )
+
+        if not tracks:
+            return dropped
 
         if not player.is_playing:
-            await voice_channel.connect(cls=LavalinkVoiceClient)
+            player.add(tracks[0], requester=requester)
+            tracks = tracks[1:]
+
+            await self.place_player(player, voice_channel)
+
+            voice_client = voice_channel.guild.voice_client
+            if voice_client is None:
+                await voice_channel.connect(cls=LavalinkVoiceClient)
+            elif voice_client.channel != voice_channel:
+                await voice_channel.guild.change_voice_state(channel=voice_channel, self_deaf=True)
             await player.play()
 
+        chunk_size = max(env.BOT_QUEUE_CHUNK_SIZE, 1)
+        for i in range(0, len(tracks), chunk_size):
+            for track in tracks[i:i + chunk_size]:
+                player.add(track, requester=requester)
+
+            await asyncio.sleep(0)
+
+        queue_store.mark(player)
+
         if player.queue:
-            await QueueEmbed.update(self, player.guild_id, player.queue)
+            self.render_queue(player.guild_id)
 
-        guild = self.bot.get_guild(player.guild_id)
         self.logger.info(
             f'[{guild.name}] - Track added to queue'
             f'({player.current.author} - {player.current.title} [{player.current.uri}] | '
             f'Requested by: {player.current.requester}) on the server.'
         )
 
+        return dropped
+
     @discord.app_commands.command(
         name='setup',
         description=lang.SetupCommandDescription
@@ -134,12 +572,12 @@ class Music(commands.Cog):
 
         player_message = await interaction.channel.send(
             embed=NothingPlayEmbed(),
-            view=NothingPlayView(self, interaction.guild)
+            view=self.nothing_play_view
         )
 
         queue_message = await interaction.channel.send(
             embed=QueueEmbed(),
-            view=QueueView(interaction.guild_id)
+            view=self.queue_view
         )
 
         guild_model = await GuildModel.add(
@@ -158,6 +596,10 @@ class Music(commands.Cog):
     @commands.Cog.listener()
     async def on_guild_remove(self, guild: discord.Guild) -> None:
         await self.lavalink.player_manager.destroy(guild.id)
+        render_scheduler.cancel(guild.id)
+        message_fingerprints.forget(guild.id)
+        queue_pages.invalidate(guild.id)
+        queue_store.forget(guild.id)
         await GuildModel.delete(guild.id)
 
         self.logger.debug(f'[{guild.name}] - Kicked from the server.')
@@ -169,28 +611,54 @@ class Music(commands.Cog):
         before: discord.VoiceState,
         after: discord.VoiceState
     ) -> None:
-        if user == self.bot.user:
-            if not after.channel:
+        before_id = before.channel.id if before.channel else None
+        after_id = after.channel.id if after.channel else None
+
+        if user.id == self.bot.user.id:
+            if before_id != after_id:
+                self.voice_occupancy.pop(before_id, None)
+            if after.channel:
+                self.voice_occupancy[after_id] = sum(
+                    1 for member in after.channel.members if member.id != self.bot.user.id
+                )
+            elif before.channel:
                 player: LavalinkPlayer = self.lavalink.player_manager.get(before.channel.guild.id)
+                if player:
+                    player.queue.clear()
+                    queue_store.mark(player)
 
-                player.queue.clear()
+                self.render_player(before.channel.guild.id)
+                self.render_queue(before.channel.guild.id)
 
-                await NothingPlayEmbed.update(self, before.channel.guild.id)
-                await QueueEmbed.update(self, before.channel.guild.id)
-        elif before.channel:
-            voice_client: LavalinkVoiceClient = before.channel.guild.voice_client
-            if voice_client and before.channel == voice_client.channel:
-                if len(before.channel.members) == 1 and before.channel.members[0] == self.bot.user:
+            return
+
+        if before_id == after_id:
+            return
+
+        if after_id in self.voice_occupancy:
+            self.voice_occupancy[after_id] += 1
+
+        if before_id in self.voice_occupancy:
+            self.voice_occupancy[before_id] -= 1
+            if self.voice_occupancy[before_id] > 0:
+                return
+
+            self.voice_occupancy[before_id] = sum(
+                1 for member in before.channel.members if member.id != self.bot.user.id
+            )
+            if self.voice_occupancy[before_id] == 0:
+                voice_client: LavalinkVoiceClient = before.channel.guild.voice_client
+                if voice_client:
                     await voice_client.disconnect(force=True)
 
     @lavalink.listener(lavalink.TrackStartEvent)
     async def on_track_start(self, event: lavalink.TrackStartEvent) -> None:
         player: LavalinkPlayer = event.player
 
-        await PlayNowEmbed.update(self, player.guild_id, player.current)
-        await QueueEmbed.update(self, player.guild_id, player.queue)
+        self.render_player(player.guild_id, player.current)
+        self.render_queue(player.guild_id)
 
-        await HistoryModel.add(
+        await history_buffer.put(
             player.guild_id,
             player.current.author,
             player.current.title,
@@ -198,6 +666,8 @@ class Music(commands.Cog):
         )
 
         player.last = player.current
+        player.idle_since = None
+        queue_store.mark(player)
 
         guild = self.bot.get_guild(player.guild_id)
         self.logger.info(
@@ -206,24 +676,70 @@ class Music(commands.Cog):
             f'Requested by: {player.current.requester}) on the server.'
         )
 
+    @lavalink.listener(lavalink.PlayerUpdateEvent)
+    async def on_player_update(self, event: lavalink.PlayerUpdateEvent) -> None:
+        queue_store.checkpoint(event.player)
+
+    @lavalink.listener(lavalink.NodeChangedEvent)
+    async def on_node_changed(self, event: lavalink.NodeChangedEvent) -> None:
+        player: LavalinkPlayer = event.player
+
+        queue_store.mark(player)
+
+        guild = self.bot.get_guild(player.guild_id)
+        if guild:
+            self.logger.info(
+                f'[{guild.name}] - Player moved from node {event.old_node.name} to {event.new_node.name}.'
+            )
+
     @lavalink.listener(lavalink.QueueEndEvent)
     async def on_queue_end(self, event: lavalink.QueueEndEvent) -> None:
         player: LavalinkPlayer = event.player
 
+        queue_store.mark(player)
+
+        player.idle_since = time.monotonic()
+
         guild = self.bot.get_guild(player.guild_id)
         if guild:
             voice_client = guild.voice_client
-            if voice_client:
+            if voice_client and env.BOT_IDLE_DISCONNECT_TIMEOUT <= 0:
                 await voice_client.disconnect(force=True)
+            else:
+                self.render_player(player.guild_id)
         else:
+            self.report_missing_guild(player.guild_id)
             raise PlayerChannelNotFound(self.bot, player.guild_id)
 
         self.logger.info(f'{guild.name} - Queue is over on the server.')
 
+    def render_player(self, guild_id: int, track: Optional[lavalink.AudioTrack] = None) -> None:
+        async def render():
+            try:
+                if track:
+                    await PlayNowEmbed.update(self, guild_id, track)
+                else:
+                    await NothingPlayEmbed.update(self, guild_id)
+            except PlayerEntityNotFound:
+                self.report_missing_guild(guild_id)
+
+        render_scheduler.schedule(guild_id, 'player', render)
+
+    def render_queue(self, guild_id: int) -> None:
+        async def render():
+            player: LavalinkPlayer = self.lavalink.player_manager.get(guild_id)
+            if player:
+                try:
+                    await QueueEmbed.update(self, guild_id, player.queue)
+                except PlayerEntityNotFound:
+                    self.report_missing_guild(guild_id)
+
+        render_scheduler.schedule(guild_id, 'queue', render)
+
     def is_playing(self, guild_id: int):
         player: LavalinkPlayer = self.lavalink.player_manager.get(guild_id)
 
-        return len(player.queue) > 0
+        return player is not None and len(player.queue) > 0
 
 
 class PlayView(discord.ui.View):
@@ -269,11 +785,10 @@ class PlayView(discord.ui.View):
 
 
 class NothingPlayView(PlayView):
-    def __init__(self, cog: Music, guild_id: int):
+    def __init__(self, cog: Music):
         super().__init__()
 
         self.cog = cog
-        self.guild_id = guild_id
 
     @discord.ui.button(
         custom_id='btn_add',
@@ -299,13 +814,8 @@ class NothingPlayView(PlayView):
 
 
 class PlayNowView(NothingPlayView):
-    def __init__(self, cog: Music, guild_id: int):
-        super().__init__(cog, guild_id)
-
-        self.cog = cog
-        self.guild_id = guild_id
-
-        self.player: LavalinkPlayer = self.cog.lavalink.player_manager.get(guild_id)
+    def __init__(self, cog: Music):
+        super().__init__(cog)
 
     @discord.ui.button(
         custom_id='btn_skip',
@@ -315,7 +825,9 @@ class PlayNowView(NothingPlayView):
     )
     async def btn_skip(self, interaction: discord.Interaction, button: discord.Button):
         if self.cog.bot.is_user_with_bot(interaction.user):
-            await self.player.skip()
+            player: LavalinkPlayer = self.cog.lavalink.player_manager.get(interaction.guild_id)
+            if player:
+                await player.skip()
 
         await interaction.response.defer()
 
@@ -342,7 +854,7 @@ class OrderTrackModal(discord.ui.Modal):
         self.add_item(discord.ui.TextInput(label=lang.OrderTrackModalQueryLabel))
 
     async def on_submit(self, interaction: discord.Interaction):
-        player: LavalinkPlayer = self.cog.lavalink.player_manager.get(interaction.guild_id)
+        player = await self.cog.get_player(interaction.guild_id)
 
         query = self.children[0].value
 
@@ -352,7 +864,7 @@ class OrderTrackModal(discord.ui.Modal):
 
         await interaction.response.defer(thinking=True, ephemeral=True)
 
-        search_result = await player.node.get_tracks(query)
+        search_result = await track_search.get_tracks(player.node, query)
         if search_result.load_type == lavalink.LoadType.ERROR:
             raise PlayerYTSignatureError(interaction)
         if search_result.load_type == lavalink.LoadType.EMPTY:
@@ -364,12 +876,17 @@ class OrderTrackModal(discord.ui.Modal):
 
         if is_url:
             await interaction.delete_original_response()
-            await self.cog.add_to_queue(
+            dropped = await self.cog.add_to_queue(
                 interaction.guild_id,
                 interaction.user.voice.channel,
                 search_result.tracks,
                 interaction.user.nick
             )
+            if dropped:
+                await interaction.followup.send(
+                    lang.QueueLimitReached.format(emoji=Emoji.NoEntry, limit=env.BOT_QUEUE_MAX_SIZE, count=dropped),
+                    ephemeral=True
+                )
         else:
             await interaction.followup.send(
                 embed=TrackSelectEmbed(search_result.tracks[:5]),
@@ -417,21 +934,43 @@ class TrackSelect(discord.ui.Select):
     async def callback(self, interaction: discord.Interaction) -> None:
         self.view.track_selected = True
 
-        await self.cog.add_to_queue(
+        dropped = await self.cog.add_to_queue(
             interaction.guild_id,
             interaction.user.voice.channel,
             [self.tracks[int(self.values[0])]],
             requester=interaction.user.nick
         )
+        if dropped:
+            await interaction.response.send_message(
+                lang.QueueLimitReached.format(emoji=Emoji.NoEntry, limit=env.BOT_QUEUE_MAX_SIZE, count=dropped),
+                ephemeral=True,
+                delete_after=10
+            )
 
         await self.interaction.delete_original_response()
 
 
 class QueueView(discord.ui.View):
-    def __init__(self, guild_id: int):
+    def __init__(self, cog: Music):
         super().__init__(timeout=None)
 
-        self.guild_id = guild_id
+        self.cog = cog
+
+    @discord.ui.button(
+        custom_id='btn_queue',
+        emoji=Emoji.Scroll,
+        label=lang.QueueButtonBrowse,
+        style=discord.ButtonStyle.gray
+    )
+    async def btn_queue(self, interaction: discord.Interaction, _button: discord.Button):
+        queue_page_view = QueuePageView(self.cog, interaction.guild_id)
+
+        await interaction.response.send_message(
+            embed=queue_page_view.load_page(),
+            view=queue_page_view,
+            ephemeral=True,
+            delete_after=60
+        )
 
     @discord.ui.button(
         custom_id='btn_history',
@@ -440,15 +979,134 @@ class QueueView(discord.ui.View):
         style=discord.ButtonStyle.gray
     )
     async def btn_history(self, interaction: discord.Interaction, _button: discord.Button):
-        history_models = await HistoryModel.get(self.guild_id)
+        history_view = HistoryView(interaction.guild_id)
+        history_page = await history_view.load_page()
 
         await interaction.response.send_message(
-            embed=HistoryEmbed(history_models),
+            embed=history_page.rendered,
+            view=history_view,
             ephemeral=True,
             delete_after=60
         )
 
 
+class QueuePageView(discord.ui.View):
+    def __init__(self, cog: Music, guild_id: int):
+        super().__init__(timeout=60)
+
+        self.cog = cog
+        self.guild_id = guild_id
+
+        self.page = 1
+        self.pages = 1
+
+    def load_page(self) -> 'QueueEmbed':
+        player: LavalinkPlayer = self.cog.lavalink.player_manager.get(self.guild_id)
+        queue = player.queue if player else []
+
+        self.pages = QueueEmbed.get_pages(queue)
+        self.page = min(max(self.page, 1), self.pages)
+
+        self.btn_previous.disabled = self.page == 1
+        self.btn_next.disabled = self.page == self.pages
+        self.btn_jump.disabled = self.pages == 1
+
+        return queue_pages.get_embed(self.guild_id, queue, self.page)
+
+    @discord.ui.button(
+        emoji=Emoji.ArrowBackward,
+        style=discord.ButtonStyle.gray
+    )
+    async def btn_previous(self, interaction: discord.Interaction, _button: discord.Button):
+        self.page -= 1
+
+        await interaction.response.edit_message(embed=self.load_page(), view=self)
+
+    @discord.ui.button(
+        emoji=Emoji.ArrowForward,
+        style=discord.ButtonStyle.gray
+    )
+    async def btn_next(self, interaction: discord.Interaction, _button: discord.Button):
+        self.page += 1
+
+        await interaction.response.edit_message(embed=self.load_page(), view=self)
+
+    @discord.ui.button(
+        emoji=Emoji.Hash,
+        label=lang.QueueButtonJump,
+        style=discord.ButtonStyle.gray
+    )
+    async def btn_jump(self, interaction: discord.Interaction, _button: discord.Button):
+        await interaction.response.send_modal(QueueJumpModal(self))
+
+
+class QueueJumpModal(discord.ui.Modal):
+    def __init__(self, queue_page_view: QueuePageView):
+        super().__init__(title=lang.QueueJumpModalTitle, timeout=60)
+
+        self.queue_page_view = queue_page_view
+
+        self.add_item(discord.ui.TextInput(
+            label=lang.QueueJumpModalPageLabel.format(pages=queue_page_view.pages),
+            max_length=6
+        ))
+
+    async def on_submit(self, interaction: discord.Interaction):
+        page = self.children[0].value.strip()
+        if page.isdigit():
+            self.queue_page_view.page = int(page)
+
+        await interaction.response.edit_message(
+            embed=self.queue_page_view.load_page(),
+            view=self.queue_page_view
+        )
+
+
+class HistoryView(discord.ui.View):
+    def __init__(self, guild_id: int):
+        super().__init__(timeout=60)
+
+        self.guild_id = guild_id
+
+        self.cursors: List[Optional[HistoryCursor]] = [None]
+
+    async def load_page(self) -> HistoryPage:
+        history_page = await HistoryModel.get_page(self.guild_id, self.cursors[-1])
+        if history_page.rendered is None:
+            history_page.rendered = HistoryEmbed(history_page, len(self.cursors))
+
+        self.btn_previous.disabled = len(self.cursors) == 1
+        self.btn_next.disabled = not history_page.has_next
+
+        self.page = history_page
+
+        return history_page
+
+    @discord.ui.button(
+        emoji=Emoji.ArrowBackward,
+        style=discord.ButtonStyle.gray
+    )
+    async def btn_previous(self, interaction: discord.Interaction, _button: discord.Button):
+        if len(self.cursors) > 1:
+            self.cursors.pop()
+
+        history_page = await self.load_page()
+
+        await interaction.response.edit_message(embed=history_page.rendered, view=self)
+
+    @discord.ui.button(
+        emoji=Emoji.ArrowForward,
+        style=discord.ButtonStyle.gray
+    )
+    async def btn_next(self, interaction: discord.Interaction, _button: discord.Button):
+        if self.page.has_next:
+            self.cursors.append(self.page.cursor)
+
+        history_page = await self.load_page()
+
+        await interaction.response.edit_message(embed=history_page.rendered, view=self)
+
+
 class NothingPlayEmbed(discord.Embed):
     def __init__(self):
         super().__init__(title=lang.NothingPlayEmbedTitle)
@@ -469,9 +1127,11 @@ class NothingPlayEmbed(discord.Embed):
             player_message = channel.get_partial_message(guild_model.player_message_id)
             if player_message:
                 try:
-                    await player_message.edit(
-                        embed=NothingPlayEmbed(),
-                        view=NothingPlayView(cog, guild_id)
+                    await message_fingerprints.edit(
+                        guild_id,
+                        player_message,
+                        NothingPlayEmbed(),
+                        cog.nothing_play_view
                     )
                 except discord.errors.NotFound:
                     raise PlayerMessageNotFound(cog.bot, guild_id)
@@ -514,9 +1174,11 @@ class PlayNowEmbed(discord.Embed):
             player_message = channel.get_partial_message(guild_model.player_message_id)
             if player_message:
                 try:
-                    await player_message.edit(
-                        embed=PlayNowEmbed(track),
-                        view=PlayNowView(cog, guild_id)
+                    await message_fingerprints.edit(
+                        guild_id,
+                        player_message,
+                        PlayNowEmbed(track),
+                        cog.play_now_view
                     )
                 except discord.errors.NotFound:
                     raise PlayerMessageNotFound(cog.bot, guild_id)
@@ -544,22 +1206,27 @@ class TrackSelectEmbed(discord.Embed):
 
 
 class QueueEmbed(discord.Embed):
-    def __init__(self, queue: List[lavalink.AudioTrack] = None):
+    page_size = 20
+
+    def __init__(self, queue: List[QueueEntry] = None, page: Optional[int] = None):
         super().__init__(title=lang.QueueEmbedTitle)
 
         self.colour = 15548997
 
         if queue:
-            for i, track in enumerate(queue[:20], 1):
+            start = ((page or 1) - 1) * self.page_size
+            for i, track in enumerate(queue[start:start + self.page_size], start + 1):
+                author, value = self.get_field(track)
                 self.add_field(
-                    name=f'**{i}.** {track.author}',
-                    value=f'[{track.title}]({track.uri}) '
-                          f'({utils.get_formatted_duration(track.duration)})',
+                    name=f'**{i}.** {author}',
+                    value=value,
                     inline=False
                 )
-            if len(queue) > 20:
+            if page is not None:
+                self.set_footer(text=lang.QueueEmbedPageFooter.format(page=page, pages=self.get_pages(queue)))
+            elif len(queue) > self.page_size:
                 self.add_field(
-                    name=lang.QueueEmbedOverflowFieldName.format(count=len(queue) - 20),
+                    name=lang.QueueEmbedOverflowFieldName.format(count=len(queue) - self.page_size),
                     value=lang.QueueEmbedOverflowFieldValue
                 )
             else:
@@ -573,8 +1240,23 @@ class QueueEmbed(discord.Embed):
                 value=lang.QueueEmbedHintFieldValue
             )
 
+    @classmethod
+    def get_pages(cls, queue: List[QueueEntry]) -> int:
+        return max((len(queue) + cls.page_size - 1) // cls.page_size, 1)
+
     @staticmethod
-    async def update(cog: Music, guild_id: int, queue: List[lavalink.AudioTrack] = None) -> int:
+    def get_field(track: QueueEntry) -> Tuple[str, str]:
+        field = track.queue_field
+        if field is None:
+            field = track.queue_field = (
+                track.author,
+                f'[{track.title}]({track.uri}) ({utils.get_formatted_duration(track.duration)})'
+            )
+
+        return field
+
+    @staticmethod
+    async def update(cog: Music, guild_id: int, queue: List[QueueEntry] = None) -> int:
         guild_model = await GuildModel.get(guild_id)
 
         channel: discord.TextChannel = cog.bot.get_channel(guild_model.channel_id)
@@ -582,9 +1264,11 @@ class QueueEmbed(discord.Embed):
             queue_message = channel.get_partial_message(guild_model.queue_message_id)
             if queue_message:
                 try:
-                    await queue_message.edit(
-                        embed=QueueEmbed(queue),
-                        view=QueueView(guild_id)
+                    await message_fingerprints.edit(
+                        guild_id,
+                        queue_message,
+                        queue_pages.get_embed(guild_id, queue or []),
+                        cog.queue_view
                     )
                 except discord.errors.NotFound:
                     raise PlayerMessageNotFound(cog.bot, guild_id)
@@ -596,14 +1280,44 @@ class QueueEmbed(discord.Embed):
         return queue_message.id
 
 
+class QueuePageCache(LRUCache[int, Dict[Optional[int], Tuple[tuple, QueueEmbed]]]):
+    def get_embed(self, guild_id: int, queue: List[QueueEntry], page: Optional[int] = None) -> QueueEmbed:
+        pages = self.lookup(guild_id)
+        if pages is None:
+            pages = {}
+            self.set(guild_id, pages)
+
+        for cached_page in [cached_page for cached_page in pages if (cached_page or 1) > QueueEmbed.get_pages(queue)]:
+            del pages[cached_page]
+
+        start = ((page or 1) - 1) * QueueEmbed.page_size
+        key = (tuple(queue[start:start + QueueEmbed.page_size]), len(queue))
+
+        cached = pages.get(page)
+        if cached is not None and cached[0] == key:
+            self.record(True)
+            return cached[1]
+
+        self.record(False)
+
+        queue_embed = QueueEmbed(queue, page)
+        pages[page] = (key, queue_embed)
+
+        return queue_embed
+
+
+queue_pages = QueuePageCache(env.BOT_QUEUE_PAGE_CACHE_SIZE)
+
+
 class HistoryEmbed(discord.Embed):
-    def __init__(self, history: list[HistoryModel]):
+    def __init__(self, history_page: HistoryPage, page: int):
         super().__init__(title=lang.HistoryEmbedTitle)
 
         self.colour = 15548997
 
-        if history:
-            for i, row in enumerate(history, 1):
+        if history_page.rows:
+            start = (page - 1) * HistoryModel.page_size + 1
+            for i, row in enumerate(history_page.rows, start):
                 self.add_field(
                     name=f'**{i}.** {row.author}',
                     value=f'[{row.title}]({row.uri})',
@@ -619,12 +1333,15 @@ class HistoryEmbed(discord.Embed):
                 value=lang.HistoryEmbedHintFieldValue
             )
 
+        self.set_footer(text=lang.HistoryEmbedPageFooter.format(page=page))
+
 
 class PlayerEntityNotFound(commands.CommandError):
     def __init__(self, bot: 'Bot', guild_id: int, *, message: str):
         super().__init__(message)
 
-        bot.loop.create_task(GuildModel.delete(guild_id))
+        self.bot = bot
+        self.guild_id = guild_id
 
 
 class PlayerChannelNotFound(PlayerEntityNotFound):
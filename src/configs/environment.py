@@ -1,23 +1,72 @@
+from typing import List, Literal, Optional
+
 from functools import lru_cache
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings
 
 
+class LavalinkNodeSettings(BaseModel):
+    host: str
+    port: int = 2333
+    password: str
+    region: str
+    name: Optional[str] = None
+    ssl: bool = False
+
+
 class EnvironmentSettings(BaseSettings):
     BOT_TOKEN: str
     BOT_TITLE: str = 'soundmate'
     BOT_VERSION: str = '1.0.0'
+    BOT_GATEWAY_PROFILE: Literal['full', 'lean'] = 'lean'
+    BOT_SHARD_COUNT: int = 0
+    BOT_CLUSTER_COUNT: int = 1
+    BOT_CLUSTER_IDS: List[int] = []
+    BOT_RENDER_INTERVAL: float = 1.0
+    BOT_RESTORE_CONCURRENCY: int = 10
+    BOT_RESTORE_RATE: float = 40.0
+    BOT_QUEUE_PAGE_CACHE_SIZE: int = 1000
+    BOT_QUEUE_MAX_SIZE: int = 5000
+    BOT_QUEUE_CHUNK_SIZE: int = 100
+    BOT_IDLE_CHECK_INTERVAL: float = 30.0
+    BOT_IDLE_DISCONNECT_TIMEOUT: float = 120.0
+    BOT_IDLE_DESTROY_TIMEOUT: float = 1800.0
+    BOT_STATS_INTERVAL: float = 300.0
 
     PG_HOST: str
     PG_PORT: int = 5432
     PG_USER: str
     PG_PASSWORD: str
     PG_DB: str
+    PG_POOL_SIZE: int = 5
+    PG_POOL_MAX_OVERFLOW: int = 10
+    PG_POOL_TIMEOUT: float = 30.0
+    PG_POOL_RECYCLE: int = 1800
+    PG_POOL_PRE_PING: bool = True
+    PG_POOL_WAIT_WARNING: float = 0.5
+    PG_GUILD_CACHE_SIZE: int = 10000
+    PG_HISTORY_BUFFER_SIZE: int = 5000
+    PG_HISTORY_FLUSH_SIZE: int = 500
+    PG_HISTORY_FLUSH_INTERVAL: float = 5.0
+    PG_HISTORY_MAX_ROWS: int = 0
+    PG_HISTORY_MAX_AGE_DAYS: int = 0
+    PG_HISTORY_PRUNE_INTERVAL: float = 3600.0
+    PG_HISTORY_PRUNE_BATCH_SIZE: int = 5000
+    PG_HISTORY_PAGE_CACHE_SIZE: int = 1000
+    PG_QUEUE_FLUSH_INTERVAL: float = 2.0
+    PG_QUEUE_CHECKPOINT_INTERVAL: float = 15.0
 
     LL_HOST: str
     LL_PORT: int = 2333
     LL_PASSWORD: str
     LL_REGION: str
     LL_OPTIONS: str = '-Xmx512M'
+    LL_NODES: List[LavalinkNodeSettings] = []
+    LL_TRACK_CACHE_SIZE: int = 2000
+    LL_TRACK_CACHE_TTL: float = 3600.0
+    LL_TRACK_CACHE_PERSIST: bool = False
+    LL_TRACK_CACHE_PERSIST_TTL: int = 86400
+    LL_RESUME_TIMEOUT: int = 60
 
     LOCALE: str = 'en'
 
@@ -0,0 +1,32 @@
+from typing import Literal
+
+import discord
+
+from src.configs.environment import get_environment_variables
+
+
+env = get_environment_variables()
+
+
+GatewayProfile = Literal['full', 'lean']
+
+
+def get_gateway_options(profile: GatewayProfile) -> dict:
+    if profile == 'full':
+        return dict(
+            intents=discord.Intents.all()
+        )
+
+    intents = discord.Intents.none()
+    intents.guilds = True
+    intents.voice_states = True
+
+    member_cache_flags = discord.MemberCacheFlags.none()
+    member_cache_flags.voice = True
+
+    return dict(
+        intents=intents,
+        member_cache_flags=member_cache_flags,
+        chunk_guilds_at_startup=False,
+        max_messages=None
+    )
@@ -18,6 +18,10 @@ class Emoji:
     Link = '🔗'
     Pencil = '✏️'
     Bookmark = '🔖'
+    ArrowBackward = '◀️'
+    ArrowForward = '▶️'
+    Scroll = '📜'
+    Hash = '#️⃣'
 
 
 @dataclass
@@ -38,6 +42,7 @@ class Russian(Language):
 
     UserNotConnected = '{emoji} Вы не подключены к голосовому каналу сервера.'
     BotAlreadyConnected = '{emoji} Бот уже подключен к голосовому каналу сервера.'
+    QueueLimitReached = '{emoji} Очередь заполнена ({limit} треков), не добавлено треков: {count}.'
 
     OrderTrackModalTitle = 'Добавить трек в очередь'
     OrderTrackModalQueryLabel = 'Введите поисковой запрос или URL'
@@ -47,6 +52,11 @@ class Russian(Language):
     TrackSelectPlaceholder = 'Выберите нужное'
 
     QueueButtonHistory = 'Недавнее'
+    QueueButtonBrowse = 'Вся очередь'
+    QueueButtonJump = 'Перейти'
+
+    QueueJumpModalTitle = 'Перейти к странице'
+    QueueJumpModalPageLabel = 'Номер страницы (1-{pages})'
 
     NothingPlayEmbedTitle = 'Сейчас ничего не играет'
     NothingPlayEmbedHintFieldName = 'Подсказка:'
@@ -61,11 +71,13 @@ class Russian(Language):
     QueueEmbedHintFieldName = 'В очереди ничего нет.'
     QueueEmbedHintFieldValue = 'Чтобы добавить трек в очередь, нажмите на кнопку **"Добавить"**'
     QueueEmbedOverflowFieldName = 'И еще несколько треков ({count})'
-    QueueEmbedOverflowFieldValue = QueueEmbedHintFieldValue
+    QueueEmbedOverflowFieldValue = 'Чтобы посмотреть всю очередь, нажмите на кнопку **"Вся очередь"**'
+    QueueEmbedPageFooter = 'Страница {page} из {pages}'
 
     HistoryEmbedTitle = 'Недавнее'
     HistoryEmbedHintFieldName = 'В истории ничего нет.'
     HistoryEmbedHintFieldValue = QueueEmbedHintFieldValue
+    HistoryEmbedPageFooter = 'Страница {page}'
 
 
 class English(Language):
@@ -80,6 +92,7 @@ class English(Language):
 
     UserNotConnected = '{emoji} You are not connected to a voice channel.'
     BotAlreadyConnected = '{emoji} Bot is already in a voice channel.'
+    QueueLimitReached = '{emoji} The queue is full ({limit} tracks), {count} tracks were not added.'
 
     OrderTrackModalTitle = 'Add a track to queue'
     OrderTrackModalQueryLabel = 'Enter a search term or URL'
@@ -89,6 +102,11 @@ class English(Language):
     TrackSelectPlaceholder = 'Pick one'
 
     QueueButtonHistory = 'History'
+    QueueButtonBrowse = 'Full queue'
+    QueueButtonJump = 'Go to'
+
+    QueueJumpModalTitle = 'Go to page'
+    QueueJumpModalPageLabel = 'Page number (1-{pages})'
 
     NothingPlayEmbedTitle = 'Nothing is playing now'
     NothingPlayEmbedHintFieldName = 'Tip:'
@@ -103,11 +121,13 @@ class English(Language):
     QueueEmbedHintFieldName = 'Queue is empty.'
     QueueEmbedHintFieldValue = 'Press **“Add”** to enqueue a track'
     QueueEmbedOverflowFieldName = 'And a few more tracks ({count})'
-    QueueEmbedOverflowFieldValue = QueueEmbedHintFieldValue
+    QueueEmbedOverflowFieldValue = 'Press **“Full queue”** to browse all tracks'
+    QueueEmbedPageFooter = 'Page {page} of {pages}'
 
     HistoryEmbedTitle = 'History'
     HistoryEmbedHintFieldName = 'History is empty.'
     HistoryEmbedHintFieldValue = QueueEmbedHintFieldValue
+    HistoryEmbedPageFooter = 'Page {page}'
 
 
 SupportedLocale = Literal[
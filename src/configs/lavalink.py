@@ -1,11 +1,16 @@
-from typing import TYPE_CHECKING
+from typing import Dict, Iterable, List, Optional, Tuple, Union, TYPE_CHECKING
 if TYPE_CHECKING:
     from src.bot import Bot
 
+import logging
+import sys
+import time
+from random import randrange
+
 import discord
 import lavalink
 
-from src.configs.environment import get_environment_variables
+from src.configs.environment import LavalinkNodeSettings, get_environment_variables
 
 
 env = get_environment_variables()
@@ -21,28 +26,153 @@ class LavalinkClient(discord.Client):
 
         return cls._instance
 
-    def __init__(self, bot: 'Bot'):
+    def __init__(self, bot: 'Bot', session_ids: Optional[Dict[str, str]] = None):
         if self._initialized:
             return
 
         super().__init__(intents=bot.intents)
 
         self.lavalink = lavalink.Client(bot.user.id, player=LavalinkPlayer)
+        self.lavalink.node_manager = LavalinkNodeManager(self.lavalink, bot.logger)
         self.logger = bot.logger
 
-        self.lavalink.add_node(
-            host=env.LL_HOST,
-            port=env.LL_PORT,
-            password=env.LL_PASSWORD,
-            region=env.LL_REGION,
-            name='default-node'
-        )
+        session_ids = session_ids or {}
+        for node in get_node_settings():
+            self.lavalink.add_node(
+                host=node.host,
+                port=node.port,
+                password=node.password,
+                region=node.region,
+                name=node.name,
+                ssl=node.ssl,
+                session_id=session_ids.get(node.name)
+            )
 
         self._initialized = True
 
     @property
     def node(self) -> lavalink.Node:
-        return self.lavalink.node_manager.nodes[0]
+        return find_ideal_node(self.lavalink, env.LL_REGION) or self.lavalink.node_manager.nodes[0]
+
+
+def get_node_settings() -> List[LavalinkNodeSettings]:
+    default_node = LavalinkNodeSettings(
+        host=env.LL_HOST,
+        port=env.LL_PORT,
+        password=env.LL_PASSWORD,
+        region=env.LL_REGION,
+        name='default-node'
+    )
+
+    return [default_node] + [
+        node if node.name else node.model_copy(update=dict(name=f'{node.region}-{node.host}:{node.port}'))
+        for node in env.LL_NODES
+    ]
+
+
+def get_session_key(user_id: int, cluster_id: int, node_name: str) -> str:
+    return f'lavalink_session:{user_id}:{cluster_id}:{node_name}'
+
+
+def get_playing_counts(client: lavalink.Client) -> Dict[lavalink.Node, int]:
+    playing_counts: Dict[lavalink.Node, int] = {}
+    for player in client.player_manager.values():
+        if player.is_playing:
+            playing_counts[player.node] = playing_counts.get(player.node, 0) + 1
+
+    return playing_counts
+
+
+def get_load_score(node: lavalink.Node, playing_counts: Dict[lavalink.Node, int]) -> float:
+    if not node.available:
+        return float('inf')
+
+    stats = node.stats
+    penalty = stats.penalty
+
+    return (
+        max(stats.playing_players, playing_counts.get(node, 0))
+        + penalty.cpu_penalty
+        + penalty.null_frame_penalty
+        + penalty.deficit_frame_penalty
+    )
+
+
+def find_ideal_node(
+    client: lavalink.Client,
+    region: Optional[str] = None,
+    exclude: Iterable[lavalink.Node] = (),
+    playing_counts: Optional[Dict[lavalink.Node, int]] = None
+) -> Optional[lavalink.Node]:
+    nodes = [node for node in client.node_manager.available_nodes if node not in exclude]
+    candidates = [node for node in nodes if node.region == region] or nodes
+    if len(candidates) <= 1:
+        return candidates[0] if candidates else None
+
+    if playing_counts is None:
+        playing_counts = get_playing_counts(client)
+
+    return min(candidates, key=lambda node: get_load_score(node, playing_counts))
+
+
+class LavalinkNodeManager(lavalink.NodeManager):
+    def __init__(self, client: lavalink.Client, logger: logging.Logger):
+        super().__init__(client, None, False)
+
+        self.logger = logger
+
+        self.migrations = 0
+        self.migration_time = 0.0
+
+    async def _handle_node_disconnect(self, node: lavalink.Node):
+        players = node.players
+        if not players:
+            return
+
+        for player in players:
+            try:
+                await player.node_unavailable()
+            except Exception as error:
+                self.logger.warning(f'Failed to mark player {player.guild_id} as unavailable: {error}')
+
+        started = time.perf_counter()
+        migrated = 0
+        playing_counts = get_playing_counts(self.client)
+
+        for i, player in enumerate(players):
+            target = find_ideal_node(self.client, node.region, exclude=[node], playing_counts=playing_counts)
+            if target is None:
+                self._player_queue.extend(players[i:])
+                self.logger.warning(
+                    f'Node {node.name} is down and no other node is available, '
+                    f'{len(players) - i} players will move once a node is ready.'
+                )
+                break
+
+            player_started = time.perf_counter()
+            try:
+                await player.change_node(target)
+            except lavalink.ClientError as error:
+                self.logger.error(f'Failed to move player {player.guild_id} from {node.name} to {target.name}: {error}')
+                continue
+
+            if player.is_playing:
+                playing_counts[target] = playing_counts.get(target, 0) + 1
+
+            migration_time = time.perf_counter() - player_started
+            self.migrations += 1
+            self.migration_time += migration_time
+            migrated += 1
+
+            self.logger.debug(
+                f'Moved player {player.guild_id} from {node.name} to {target.name} in {migration_time * 1000:.0f}ms.'
+            )
+
+        if migrated:
+            self.logger.info(
+                f'Node {node.name} is down, moved {migrated}/{len(players)} players '
+                f'in {time.perf_counter() - started:.2f}s.'
+            )
 
 
 class LavalinkVoiceClient(discord.VoiceProtocol):
@@ -58,6 +188,10 @@ class LavalinkVoiceClient(discord.VoiceProtocol):
         self.guild_id = voice_channel.guild.id
 
     async def on_voice_server_update(self, data):
+        player: LavalinkPlayer = self.lavalink.player_manager.get(self.guild_id)
+        if player:
+            player.endpoint_region = self.lavalink.node_manager.get_region(data.get('endpoint'))
+
         await self.lavalink.voice_update_handler({
             't': 'VOICE_SERVER_UPDATE',
             'd': data
@@ -123,3 +257,90 @@ class LavalinkPlayer(lavalink.DefaultPlayer):
         self.bot: 'Bot' = None
 
         self.last: lavalink.AudioTrack = None
+        self.endpoint_region: Optional[str] = None
+        self.idle_since: Optional[float] = None
+
+    def add(
+        self,
+        track: Union['QueueEntry', lavalink.AudioTrack, dict],
+        requester: Optional[str] = None,
+        index: Optional[int] = None
+    ) -> None:
+        if not isinstance(track, QueueEntry):
+            if isinstance(track, dict):
+                track = lavalink.AudioTrack(track, 0)
+            track = QueueEntry.from_track(track)
+
+        if requester:
+            track.requester = sys.intern(str(requester))
+
+        if index is None:
+            self.queue.append(track)
+        else:
+            self.queue.insert(index, track)
+
+    async def play(self, track: Union['QueueEntry', lavalink.AudioTrack, dict, None] = None, **kwargs) -> None:
+        if isinstance(track, QueueEntry):
+            track = track.to_track()
+        elif track is None and self.queue and not (self.loop == self.LOOP_SINGLE and self.current):
+            track = self.queue.pop(randrange(len(self.queue)) if self.shuffle else 0).to_track()
+
+        await super().play(track, **kwargs)
+
+
+def decode_track(encoded: str, requester: Optional[str] = None) -> lavalink.AudioTrack:
+    track = lavalink.decode_track(encoded)
+
+    track.track = encoded
+    track.raw['encoded'] = encoded
+    track.requester = requester
+
+    return track
+
+
+class QueueEntry:
+    __slots__ = ('track', 'author', 'title', 'uri', 'duration', 'requester', 'queue_seq', 'queue_field')
+
+    def __init__(
+        self,
+        track: str,
+        author: str,
+        title: str,
+        uri: str,
+        duration: int,
+        requester: Optional[str] = None,
+        queue_seq: Optional[int] = None
+    ):
+        self.track = track
+        self.author = author
+        self.title = title
+        self.uri = uri
+        self.duration = duration
+        self.requester = sys.intern(requester) if requester else None
+        self.queue_seq = queue_seq
+        self.queue_field: Optional[Tuple[str, str]] = None
+
+    @classmethod
+    def from_track(cls, track: lavalink.AudioTrack) -> 'QueueEntry':
+        return cls(
+            track.track,
+            track.author,
+            track.title,
+            track.uri,
+            track.duration,
+            str(track.requester) if track.requester else None
+        )
+
+    @classmethod
+    def from_encoded(
+        cls,
+        encoded: str,
+        requester: Optional[str] = None,
+        queue_seq: Optional[int] = None
+    ) -> 'QueueEntry':
+        track = lavalink.decode_track(encoded)
+
+        return cls(encoded, track.author, track.title, track.uri, track.duration, requester, queue_seq)
+
+    def to_track(self) -> lavalink.AudioTrack:
+        return decode_track(self.track, self.requester)
@@ -1,3 +1,5 @@
+from typing import Optional
+
 import logging
 from dataclasses import dataclass
 
@@ -41,8 +43,8 @@ class LogMessage:
 
 
 class Logger(logging.Logger):
-    def __init__(self):
-        super().__init__(name=env.BOT_TITLE)
+    def __init__(self, name: Optional[str] = None):
+        super().__init__(name=name or env.BOT_TITLE)
 
         self.addHandler(StreamHandler())
         self.setLevel(logging.DEBUG if env.DEBUG else logging.INFO)
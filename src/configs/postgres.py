@@ -1,5 +1,8 @@
 from typing import AsyncGenerator
 
+import time
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     create_async_engine,
@@ -8,21 +11,94 @@ from sqlalchemy.ext.asyncio import (
 from contextlib import asynccontextmanager
 
 from src.configs.environment import get_environment_variables
+from src.configs.logger import Logger
 
 
 env = get_environment_variables()
+logger = Logger()
 
 
 URI = f'postgresql+asyncpg://{env.PG_USER}:{env.PG_PASSWORD}@' \
       f'{env.PG_HOST}:{env.PG_PORT}/{env.PG_DB}'
 
 
-async_engine = create_async_engine(URI, echo=env.DEBUG, future=True)
+async_engine = create_async_engine(
+    URI,
+    echo=env.DEBUG,
+    future=True,
+    pool_size=env.PG_POOL_SIZE,
+    max_overflow=env.PG_POOL_MAX_OVERFLOW,
+    pool_timeout=env.PG_POOL_TIMEOUT,
+    pool_recycle=env.PG_POOL_RECYCLE,
+    pool_pre_ping=env.PG_POOL_PRE_PING
+)
 async_session = async_sessionmaker(autocommit=False, bind=async_engine,
                                    expire_on_commit=False)
 
 
+class PoolMetrics:
+    def __init__(self):
+        self.checkouts = 0
+        self.peak_checked_out = 0
+
+        self.waits = 0
+        self.slow_waits = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    @property
+    def checked_out(self) -> int:
+        return async_engine.pool.checkedout()
+
+    @property
+    def overflow(self) -> int:
+        return max(async_engine.pool.overflow(), 0)
+
+    @property
+    def average_wait_time(self) -> float:
+        return self.total_wait_time / self.waits if self.waits else 0.0
+
+    def on_checkout(self) -> None:
+        self.checkouts += 1
+        self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def on_wait(self, wait_time: float) -> None:
+        self.waits += 1
+        self.total_wait_time += wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+
+        if wait_time >= env.PG_POOL_WAIT_WARNING:
+            self.slow_waits += 1
+            logger.warning(
+                f'Waited {wait_time:.3f}s to acquire a database connection '
+                f'(pool wait{" and pre-ping round trip" if env.PG_POOL_PRE_PING else ""}; {self})'
+            )
+
+    def __str__(self) -> str:
+        return (
+            f'checked out: {self.checked_out}/{env.PG_POOL_SIZE}, '
+            f'overflow: {self.overflow}/{env.PG_POOL_MAX_OVERFLOW}, '
+            f'peak: {self.peak_checked_out}, '
+            f'checkouts: {self.checkouts}, '
+            f'slow acquires: {self.slow_waits}, '
+            f'average acquire: {self.average_wait_time:.3f}s, '
+            f'max acquire: {self.max_wait_time:.3f}s'
+        )
+
+
+pool_metrics = PoolMetrics()
+
+
+@event.listens_for(async_engine.sync_engine, 'checkout')
+def on_checkout(*_args) -> None:
+    pool_metrics.on_checkout()
+
+
 @asynccontextmanager
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
+        started = time.perf_counter()
+        await session.connection()
+        pool_metrics.on_wait(time.perf_counter() - started)
+
         yield session
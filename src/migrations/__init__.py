@@ -0,0 +1 @@
+from .migrator import migrate
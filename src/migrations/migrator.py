@@ -0,0 +1,77 @@
+import logging
+
+from sqlalchemy import (
+    MetaData,
+    Table,
+    Column,
+    Integer,
+    Text,
+    DateTime,
+    select,
+    insert,
+    func,
+    text
+)
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.configs.postgres import async_engine
+from src.migrations.versions import MIGRATIONS, Migration
+
+
+MIGRATION_LOCK_ID = 0x736f756e646d6174
+
+metadata = MetaData()
+
+schema_version = Table(
+    'schema_version',
+    metadata,
+    Column('version', Integer, primary_key=True),
+    Column('name', Text, nullable=False),
+    Column('applied', DateTime(timezone=False), server_default=func.now(), nullable=False)
+)
+
+
+async def get_schema_version(connection: AsyncConnection) -> int:
+    await connection.run_sync(metadata.create_all)
+
+    version = (await connection.execute(select(func.max(schema_version.c.version)))).scalar()
+
+    return version or 0
+
+
+async def apply(connection: AsyncConnection, migration: Migration) -> None:
+    for statement in migration.statements:
+        await connection.execute(text(statement))
+
+    await connection.execute(
+        insert(schema_version)
+        .values(version=migration.version, name=migration.name)
+    )
+
+
+async def migrate(logger: logging.Logger) -> int:
+    async with async_engine.connect() as lock_connection:
+        await lock_connection.execute(select(func.pg_advisory_lock(MIGRATION_LOCK_ID)))
+        try:
+            return await migrate_locked(logger)
+        finally:
+            await lock_connection.execute(select(func.pg_advisory_unlock(MIGRATION_LOCK_ID)))
+
+
+async def migrate_locked(logger: logging.Logger) -> int:
+    async with async_engine.begin() as connection:
+        version = await get_schema_version(connection)
+
+    pending = [migration for migration in MIGRATIONS if migration.version > version]
+    if not pending:
+        logger.debug(f'Database schema is up to date (version {version}).')
+        return version
+
+    for migration in pending:
+        async with async_engine.begin() as connection:
+            await apply(connection, migration)
+
+        version = migration.version
+        logger.info(f'Applied database migration {version} ({migration.name}).')
+
+    return version
@@ -0,0 +1,112 @@
+from typing import List
+
+
+class Migration:
+    def __init__(self, version: int, name: str, statements: List[str]):
+        self.version = version
+        self.name = name
+        self.statements = statements
+
+
+MIGRATIONS = [
+    Migration(1, 'initial', [
+        '''
+        CREATE TABLE IF NOT EXISTS guild (
+            guild_id BIGINT NOT NULL,
+            channel_id BIGINT NOT NULL,
+            player_message_id BIGINT NOT NULL,
+            queue_message_id BIGINT NOT NULL,
+            id SERIAL NOT NULL,
+            added TIMESTAMP WITHOUT TIME ZONE DEFAULT now() NOT NULL,
+            updated TIMESTAMP WITHOUT TIME ZONE,
+            CONSTRAINT pk_guild PRIMARY KEY (id)
+        )
+        ''',
+        'CREATE UNIQUE INDEX IF NOT EXISTS ix_guild_guild_id ON guild (guild_id)',
+        '''
+        CREATE TABLE IF NOT EXISTS history (
+            guild_id BIGINT NOT NULL,
+            author TEXT NOT NULL,
+            title TEXT NOT NULL,
+            uri TEXT NOT NULL,
+            id SERIAL NOT NULL,
+            added TIMESTAMP WITHOUT TIME ZONE DEFAULT now() NOT NULL,
+            updated TIMESTAMP WITHOUT TIME ZONE,
+            CONSTRAINT pk_history PRIMARY KEY (id),
+            CONSTRAINT fk_history_guild_id_guild FOREIGN KEY(guild_id)
+                REFERENCES guild (guild_id) ON DELETE CASCADE ON UPDATE CASCADE
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS ix_history_guild_id ON history (guild_id)'
+    ]),
+    Migration(2, 'history_guild_id_added_index', [
+        'CREATE INDEX IF NOT EXISTS ix_history_guild_id_added ON history (guild_id, added DESC)',
+        'DROP INDEX IF EXISTS ix_history_guild_id'
+    ]),
+    Migration(3, 'persistent_queues', [
+        '''
+        CREATE TABLE IF NOT EXISTS queue (
+            guild_id BIGINT NOT NULL,
+            seq BIGINT NOT NULL,
+            track TEXT NOT NULL,
+            requester TEXT,
+            id SERIAL NOT NULL,
+            added TIMESTAMP WITHOUT TIME ZONE DEFAULT now() NOT NULL,
+            updated TIMESTAMP WITHOUT TIME ZONE,
+            CONSTRAINT pk_queue PRIMARY KEY (id),
+            CONSTRAINT uq_queue_guild_id_seq UNIQUE (guild_id, seq),
+            CONSTRAINT fk_queue_guild_id_guild FOREIGN KEY(guild_id)
+                REFERENCES guild (guild_id) ON DELETE CASCADE ON UPDATE CASCADE
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS queue_state (
+            guild_id BIGINT NOT NULL,
+            voice_channel_id BIGINT,
+            track TEXT,
+            requester TEXT,
+            position INTEGER NOT NULL,
+            id SERIAL NOT NULL,
+            added TIMESTAMP WITHOUT TIME ZONE DEFAULT now() NOT NULL,
+            updated TIMESTAMP WITHOUT TIME ZONE,
+            CONSTRAINT pk_queue_state PRIMARY KEY (id),
+            CONSTRAINT uq_queue_state_guild_id UNIQUE (guild_id),
+            CONSTRAINT fk_queue_state_guild_id_guild FOREIGN KEY(guild_id)
+                REFERENCES guild (guild_id) ON DELETE CASCADE ON UPDATE CASCADE
+        )
+        '''
+    ]),
+    Migration(4, 'track_cache', [
+        '''
+        CREATE TABLE IF NOT EXISTS track_cache (
+            query TEXT NOT NULL,
+            load_type TEXT NOT NULL,
+            playlist_name TEXT,
+            selected_track INTEGER NOT NULL,
+            tracks JSONB NOT NULL,
+            id SERIAL NOT NULL,
+            added TIMESTAMP WITHOUT TIME ZONE DEFAULT now() NOT NULL,
+            updated TIMESTAMP WITHOUT TIME ZONE,
+            CONSTRAINT pk_track_cache PRIMARY KEY (id),
+            CONSTRAINT uq_track_cache_query UNIQUE (query)
+        )
+        '''
+    ]),
+    Migration(5, 'state', [
+        '''
+        CREATE TABLE IF NOT EXISTS state (
+            key TEXT NOT NULL,
+            value TEXT NOT NULL,
+            id SERIAL NOT NULL,
+            added TIMESTAMP WITHOUT TIME ZONE DEFAULT now() NOT NULL,
+            updated TIMESTAMP WITHOUT TIME ZONE,
+            CONSTRAINT pk_state PRIMARY KEY (id),
+            CONSTRAINT uq_state_key UNIQUE (key)
+        )
+        '''
+    ]),
+    Migration(6, 'history_guild_id_added_id_index', [
+        'CREATE INDEX IF NOT EXISTS ix_history_guild_id_added_id ON history (guild_id, added DESC, id DESC)',
+        'DROP INDEX IF EXISTS ix_history_guild_id_added'
+    ])
+]
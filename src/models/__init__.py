@@ -1,4 +1,5 @@
 from __future__ import annotations
+from typing import List
 from datetime import datetime
 
 from sqlalchemy import (
@@ -29,6 +30,24 @@ class BaseModel(DeclarativeBase):
         "pk": "pk_%(table_name)s"
     })
 
+    @classmethod
+    def on_shards(cls, shard_ids: List[int], shard_count: int):
+        return (cls.guild_id.op('>>')(22) % shard_count).in_(shard_ids)
+
 
 from .guild import GuildModel
-from .history import HistoryModel
+from .history import (
+    HistoryModel,
+    HistoryPage,
+    HistoryCursor,
+    history_buffer,
+    history_pruner
+)
+from .queue import (
+    QueueModel,
+    QueueStateModel,
+    QueueSnapshot,
+    queue_store
+)
+from .track import TrackCacheModel
+from .state import StateModel
@@ -0,0 +1,73 @@
+from typing import Optional
+
+import asyncio
+import logging
+
+
+class BackgroundFlusher:
+    def __init__(self, flush_interval: float):
+        self.flush_interval = flush_interval
+
+        self.logger: Optional[logging.Logger] = None
+
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self, logger: logging.Logger) -> None:
+        if self._task is not None:
+            return
+
+        self.logger = logger
+
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+
+        self._closing = True
+        self._wakeup.set()
+
+        await self._task
+
+        self._task = None
+
+    def wakeup(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            await self._flush()
+
+    async def _flush(self) -> None:
+        raise NotImplementedError
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            self._wakeup.clear()
+
+            await self._safe_flush()
+
+        await self._safe_flush()
+
+    async def _safe_flush(self) -> None:
+        try:
+            await self.flush()
+        except Exception as error:
+            self.logger.exception(f'{type(self).__name__} failed to flush: {error}')
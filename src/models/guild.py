@@ -1,4 +1,4 @@
-from typing import List, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 if TYPE_CHECKING:
     from src.models import HistoryModel
 
@@ -11,14 +11,23 @@ from sqlalchemy import (
 from sqlalchemy.orm import (
     Mapped,
     mapped_column,
-    relationship
+    relationship,
+    load_only
 )
 from sqlalchemy.dialects.postgresql import insert
 
+from src.cache import LRUCache
+from src.configs.environment import get_environment_variables
 from src.configs.postgres import get_async_session
 from src.models import BaseModel
 
 
+env = get_environment_variables()
+
+
+guild_cache: 'LRUCache[int, GuildModel]' = LRUCache(env.PG_GUILD_CACHE_SIZE)
+
+
 class GuildModel(BaseModel):
     __tablename__ = 'guild'
 
@@ -28,7 +37,17 @@ class GuildModel(BaseModel):
     player_message_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
     queue_message_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
 
-    guild_history: Mapped[List['HistoryModel']] = relationship(back_populates='guild', lazy='selectin')
+    guild_history: Mapped[List['HistoryModel']] = relationship(back_populates='guild', lazy='raise')
+
+    @classmethod
+    def lean(cls):
+        return load_only(
+            cls.guild_id,
+            cls.channel_id,
+            cls.player_message_id,
+            cls.queue_message_id,
+            raiseload=True
+        )
 
     @classmethod
     async def add(
@@ -63,29 +82,49 @@ class GuildModel(BaseModel):
 
             guild_model = result.scalar_one()
 
+            guild_cache.set(guild_model.guild_id, guild_model)
+
             return guild_model
 
     @classmethod
-    async def get_all(cls) -> list['GuildModel']:
+    async def get_all(
+        cls,
+        shard_ids: Optional[List[int]] = None,
+        shard_count: Optional[int] = None
+    ) -> list['GuildModel']:
         async with get_async_session() as session:
             query = (
                 select(cls)
+                .options(cls.lean())
             )
+            if shard_ids is not None:
+                query = query.filter(cls.on_shards(shard_ids, shard_count))
 
             guild_models = (await session.execute(query)).scalars().all()
 
+            for guild_model in guild_models:
+                guild_cache.set(guild_model.guild_id, guild_model)
+
             return guild_models
 
     @classmethod
     async def get(cls, guild_id: int) -> 'GuildModel':
+        guild_model = guild_cache.get(guild_id)
+        if guild_model is not None:
+            return guild_model
+
         async with get_async_session() as session:
             query = (
                 select(cls)
+                .options(cls.lean())
                 .filter_by(guild_id=guild_id)
             )
 
             setup_model = (await session.execute(query)).scalar_one_or_none()
 
+            if setup_model is not None:
+                guild_cache.set(setup_model.guild_id, setup_model)
+
             return setup_model
 
     @classmethod
@@ -98,3 +137,23 @@ class GuildModel(BaseModel):
 
             await session.execute(query)
             await session.commit()
+
+        guild_cache.invalidate(guild_id)
+
+    @classmethod
+    async def delete_many(cls, guild_ids: List[int]) -> None:
+        async with get_async_session() as session:
+            query = (
+                delete(cls)
+                .filter(cls.guild_id.in_(guild_ids))
+            )
+
+            await session.execute(query)
+            await session.commit()
+
+        for guild_id in guild_ids:
+            guild_cache.invalidate(guild_id)
+
+    @staticmethod
+    def invalidate(guild_id: Optional[int] = None) -> None:
+        guild_cache.invalidate(guild_id)
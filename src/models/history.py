@@ -1,31 +1,50 @@
-from typing import List, TYPE_CHECKING
-if TYPE_CHECKING:
-    from src.models import GuildModel
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import logging
+from datetime import datetime, timedelta
 
 from sqlalchemy import (
     BigInteger,
     Text,
     ForeignKey,
+    Index,
     select,
+    delete,
+    tuple_,
+    true,
+    func
 )
 from sqlalchemy.orm import (
     Mapped,
     mapped_column,
-    relationship
+    relationship,
+    load_only,
+    aliased
 )
 from sqlalchemy.dialects.postgresql import insert
 
+from src.cache import LRUCache
+from src.configs.environment import get_environment_variables
 from src.configs.postgres import get_async_session
 from src.models import BaseModel
+from src.models.flusher import BackgroundFlusher
+from src.models.guild import GuildModel
+
+
+env = get_environment_variables()
+
+
+HistoryCursor = Tuple[datetime, int]
 
 
 class HistoryModel(BaseModel):
     __tablename__ = 'history'
 
+    page_size = 20
+
     guild_id: Mapped[int] = mapped_column(
         BigInteger,
         ForeignKey('guild.guild_id', onupdate='CASCADE', ondelete='CASCADE'),
-        index=True,
         nullable=False
     )
 
@@ -33,7 +52,17 @@ class HistoryModel(BaseModel):
     title: Mapped[str] = mapped_column(Text, nullable=False)
     uri: Mapped[str] = mapped_column(Text, nullable=False)
 
-    guild: Mapped['GuildModel'] = relationship(back_populates='guild_history', lazy='joined')
+    guild: Mapped['GuildModel'] = relationship(back_populates='guild_history', lazy='raise')
+
+    @classmethod
+    def lean(cls):
+        return load_only(
+            cls.author,
+            cls.title,
+            cls.uri,
+            cls.added,
+            raiseload=True
+        )
 
     @classmethod
     async def add(
@@ -57,16 +86,292 @@ class HistoryModel(BaseModel):
             await session.execute(query)
             await session.commit()
 
+        history_pages.invalidate(guild_id)
+
     @classmethod
-    async def get(cls, guild_id: int) -> List['HistoryModel']:
+    async def add_many(cls, rows: List[dict]) -> None:
+        async with get_async_session() as session:
+            query = (
+                insert(cls)
+                .values(rows)
+            )
+
+            await session.execute(query)
+            await session.commit()
+
+        for guild_id in {row['guild_id'] for row in rows}:
+            history_pages.invalidate(guild_id)
+
+    @classmethod
+    async def get_page(cls, guild_id: int, cursor: Optional[HistoryCursor] = None) -> 'HistoryPage':
+        history_page = history_pages.get_page(guild_id, cursor)
+        if history_page is not None:
+            return history_page
+
         async with get_async_session() as session:
             query = (
                 select(cls)
+                .options(cls.lean())
                 .filter_by(guild_id=guild_id)
-                .limit(20)
-                .order_by(cls.added.desc())
+                .order_by(cls.added.desc(), cls.id.desc())
+                .limit(cls.page_size + 1)
             )
+            if cursor is not None:
+                query = query.filter(tuple_(cls.added, cls.id) < tuple_(*cursor))
 
             history_models = (await session.execute(query)).scalars().all()
 
-            return history_models
+        history_page = HistoryPage(
+            history_models[:cls.page_size],
+            has_next=len(history_models) > cls.page_size
+        )
+        history_pages.set_page(guild_id, cursor, history_page)
+
+        return history_page
+
+    @classmethod
+    async def prune_expired(cls, max_age: timedelta, batch_size: int) -> int:
+        async with get_async_session() as session:
+            expired = (
+                select(cls.id)
+                .filter(cls.added < func.now() - max_age)
+                .limit(batch_size)
+            )
+            query = (
+                delete(cls)
+                .filter(cls.id.in_(expired.scalar_subquery()))
+            )
+
+            result = await session.execute(query)
+            await session.commit()
+
+            return result.rowcount
+
+    @classmethod
+    async def prune_overflow(cls, max_rows: int, batch_size: int) -> int:
+        async with get_async_session() as session:
+            history = aliased(cls)
+            over_limit = (
+                select(cls.guild_id)
+                .group_by(cls.guild_id)
+                .having(func.count() > max_rows)
+                .subquery()
+            )
+            cutoff = (
+                select(cls.added, cls.id)
+                .filter(cls.guild_id == over_limit.c.guild_id)
+                .order_by(cls.added.desc(), cls.id.desc())
+                .offset(max_rows)
+                .limit(1)
+                .lateral()
+            )
+            overflow = (
+                select(history.id)
+                .select_from(over_limit)
+                .join(cutoff, true())
+                .join(history, history.guild_id == over_limit.c.guild_id)
+                .filter(tuple_(history.added, history.id) <= tuple_(cutoff.c.added, cutoff.c.id))
+                .limit(batch_size)
+            )
+            query = (
+                delete(cls)
+                .filter(cls.id.in_(overflow.scalar_subquery()))
+            )
+
+            result = await session.execute(query)
+            await session.commit()
+
+            return result.rowcount
+
+
+Index(
+    'ix_history_guild_id_added_id',
+    HistoryModel.guild_id,
+    HistoryModel.added.desc(),
+    HistoryModel.id.desc()
+)
+
+
+class HistoryPage:
+    def __init__(self, rows: List[HistoryModel], has_next: bool):
+        self.rows = rows
+        self.has_next = has_next
+
+        self.rendered = None
+
+    @property
+    def cursor(self) -> Optional[HistoryCursor]:
+        if not self.rows:
+            return None
+
+        return self.rows[-1].added, self.rows[-1].id
+
+
+class HistoryPageCache(LRUCache[int, Dict[Optional[HistoryCursor], HistoryPage]]):
+    def get_page(self, guild_id: int, cursor: Optional[HistoryCursor]) -> Optional[HistoryPage]:
+        history_page = (self.lookup(guild_id) or {}).get(cursor)
+        self.record(history_page is not None)
+
+        return history_page
+
+    def set_page(self, guild_id: int, cursor: Optional[HistoryCursor], history_page: HistoryPage) -> None:
+        pages = self.lookup(guild_id)
+        if pages is None:
+            self.set(guild_id, {cursor: history_page})
+        else:
+            pages[cursor] = history_page
+
+
+class HistoryBuffer(BackgroundFlusher):
+    def __init__(self, max_size: int, flush_size: int, flush_interval: float):
+        super().__init__(flush_interval)
+
+        self.max_size = max_size
+        self.flush_size = flush_size
+
+        self.dropped = 0
+
+        self._rows: List[dict] = []
+        self._unreported_drops = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    async def put(
+        self,
+        guild_id: int,
+        author: str,
+        title: str,
+        uri: str
+    ) -> None:
+        if not self.running:
+            return await HistoryModel.add(guild_id, author, title, uri)
+
+        self._rows.append(dict(
+            guild_id=guild_id,
+            author=author,
+            title=title,
+            uri=uri
+        ))
+        self._trim()
+
+        if len(self._rows) >= self.flush_size:
+            self.wakeup()
+
+    async def _flush(self) -> None:
+        rows, self._rows = self._rows, []
+
+        if rows:
+            try:
+                await HistoryModel.add_many(rows)
+            except Exception as error:
+                self._rows[:0] = rows
+                self._trim()
+
+                self.logger.warning(f'Failed to flush {len(rows)} history rows: {error}')
+
+        if self._unreported_drops:
+            self.logger.warning(
+                f'History buffer is full, dropped {self._unreported_drops} oldest rows '
+                f'({self.dropped} since start).'
+            )
+            self._unreported_drops = 0
+
+    def _trim(self) -> None:
+        overflow = len(self._rows) - self.max_size
+        if overflow > 0:
+            del self._rows[:overflow]
+
+            self.dropped += overflow
+            self._unreported_drops += overflow
+
+
+class HistoryPruner:
+    def __init__(
+        self,
+        max_rows: int,
+        max_age_days: int,
+        interval: float,
+        batch_size: int
+    ):
+        self.max_rows = max_rows
+        self.max_age = timedelta(days=max_age_days) if max_age_days > 0 else None
+        self.interval = interval
+        self.batch_size = batch_size
+
+        self.logger: Optional[logging.Logger] = None
+
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_rows > 0 or self.max_age is not None
+
+    def start(self, logger: logging.Logger) -> None:
+        if self._task is not None or not self.enabled:
+            return
+
+        self.logger = logger
+
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._task = None
+
+    async def prune(self) -> int:
+        pruned = 0
+
+        if self.max_age is not None:
+            pruned += await self._prune_batches(HistoryModel.prune_expired, self.max_age)
+        if self.max_rows > 0:
+            pruned += await self._prune_batches(HistoryModel.prune_overflow, self.max_rows)
+
+        return pruned
+
+    async def _prune_batches(self, prune, limit) -> int:
+        pruned = 0
+
+        while True:
+            deleted = await prune(limit, self.batch_size)
+            pruned += deleted
+
+            if deleted < self.batch_size:
+                return pruned
+
+            await asyncio.sleep(0)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                pruned = await self.prune()
+            except Exception as error:
+                self.logger.warning(f'Failed to prune history: {error}')
+            else:
+                if pruned:
+                    history_pages.invalidate()
+                    self.logger.info(f'Pruned {pruned} history rows.')
+
+            await asyncio.sleep(self.interval)
+
+
+history_pages = HistoryPageCache(env.PG_HISTORY_PAGE_CACHE_SIZE)
+history_buffer = HistoryBuffer(
+    env.PG_HISTORY_BUFFER_SIZE,
+    env.PG_HISTORY_FLUSH_SIZE,
+    env.PG_HISTORY_FLUSH_INTERVAL
+)
+history_pruner = HistoryPruner(
+    env.PG_HISTORY_MAX_ROWS,
+    env.PG_HISTORY_MAX_AGE_DAYS,
+    env.PG_HISTORY_PRUNE_INTERVAL,
+    env.PG_HISTORY_PRUNE_BATCH_SIZE
+)
@@ -0,0 +1,298 @@
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+if TYPE_CHECKING:
+    from src.configs.lavalink import LavalinkPlayer
+
+import time
+
+from sqlalchemy import (
+    BigInteger,
+    Integer,
+    Text,
+    ForeignKey,
+    UniqueConstraint,
+    select,
+    delete,
+    tuple_
+)
+from sqlalchemy.orm import (
+    Mapped,
+    mapped_column
+)
+from sqlalchemy.dialects.postgresql import insert
+
+from src.configs.environment import get_environment_variables
+from src.configs.postgres import get_async_session
+from src.models import BaseModel
+from src.models.flusher import BackgroundFlusher
+
+
+env = get_environment_variables()
+
+
+class QueueModel(BaseModel):
+    __tablename__ = 'queue'
+    __table_args__ = (
+        UniqueConstraint('guild_id', 'seq', name='uq_queue_guild_id_seq'),
+    )
+
+    guild_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey('guild.guild_id', onupdate='CASCADE', ondelete='CASCADE'),
+        nullable=False
+    )
+    seq: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    track: Mapped[str] = mapped_column(Text, nullable=False)
+    requester: Mapped[str] = mapped_column(Text, nullable=True)
+
+
+class QueueStateModel(BaseModel):
+    __tablename__ = 'queue_state'
+
+    guild_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey('guild.guild_id', onupdate='CASCADE', ondelete='CASCADE'),
+        unique=True,
+        nullable=False
+    )
+
+    voice_channel_id: Mapped[int] = mapped_column(BigInteger, nullable=True)
+    track: Mapped[str] = mapped_column(Text, nullable=True)
+    requester: Mapped[str] = mapped_column(Text, nullable=True)
+    position: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class QueueSnapshot:
+    def __init__(
+        self,
+        voice_channel_id: Optional[int] = None,
+        track: Optional[str] = None,
+        requester: Optional[str] = None,
+        position: int = 0
+    ):
+        self.voice_channel_id = voice_channel_id
+        self.track = track
+        self.requester = requester
+        self.position = position
+
+        self.queue: List[Tuple[int, str, Optional[str]]] = []
+
+
+class QueueStore(BackgroundFlusher):
+    def __init__(self, flush_interval: float, checkpoint_interval: float):
+        super().__init__(flush_interval)
+
+        self.checkpoint_interval = checkpoint_interval
+
+        self._dirty: Dict[int, 'LavalinkPlayer'] = {}
+        self._resync: Set[int] = set()
+        self._persisted: Dict[int, Set[int]] = {}
+        self._seq_bounds: Dict[int, Tuple[int, int]] = {}
+        self._checkpoints: Dict[int, float] = {}
+
+    def mark(self, player: 'LavalinkPlayer') -> None:
+        self._dirty[player.guild_id] = player
+        self._checkpoints[player.guild_id] = time.monotonic()
+
+    def checkpoint(self, player: 'LavalinkPlayer') -> None:
+        last_checkpoint = self._checkpoints.get(player.guild_id, 0.0)
+        if time.monotonic() - last_checkpoint >= self.checkpoint_interval:
+            self.mark(player)
+
+    def forget(self, guild_id: int) -> None:
+        self._dirty.pop(guild_id, None)
+        self._resync.discard(guild_id)
+        self._persisted.pop(guild_id, None)
+        self._seq_bounds.pop(guild_id, None)
+        self._checkpoints.pop(guild_id, None)
+
+    async def load(
+        self,
+        shard_ids: Optional[List[int]] = None,
+        shard_count: Optional[int] = None
+    ) -> Dict[int, QueueSnapshot]:
+        snapshots: Dict[int, QueueSnapshot] = {}
+
+        async with get_async_session() as session:
+            query = select(QueueStateModel)
+            if shard_ids is not None:
+                query = query.filter(QueueStateModel.on_shards(shard_ids, shard_count))
+
+            states = (await session.execute(query)).scalars().all()
+            for state in states:
+                snapshots[state.guild_id] = QueueSnapshot(
+                    state.voice_channel_id,
+                    state.track,
+                    state.requester,
+                    state.position
+                )
+
+            query = (
+                select(QueueModel.guild_id, QueueModel.seq, QueueModel.track, QueueModel.requester)
+                .order_by(QueueModel.guild_id, QueueModel.seq)
+            )
+            if shard_ids is not None:
+                query = query.filter(QueueModel.on_shards(shard_ids, shard_count))
+            for guild_id, seq, track, requester in await session.execute(query):
+                snapshots.setdefault(guild_id, QueueSnapshot()).queue.append((seq, track, requester))
+
+        for guild_id, snapshot in snapshots.items():
+            seqs = [seq for seq, _track, _requester in snapshot.queue]
+
+            self._persisted[guild_id] = set(seqs)
+            self._seq_bounds[guild_id] = (min(seqs), max(seqs) + 1) if seqs else (0, 0)
+
+        return {
+            guild_id: snapshot
+            for guild_id, snapshot in snapshots.items()
+            if snapshot.track or snapshot.queue
+        }
+
+    async def _flush(self) -> None:
+        dirty, self._dirty = self._dirty, {}
+        if not dirty:
+            return
+
+        resync, self._resync = self._resync, set()
+
+        cleared: List[int] = []
+        removed: List[Tuple[int, int]] = []
+        queue_rows: List[dict] = []
+        state_rows: List[dict] = []
+        idle: List[int] = []
+
+        try:
+            for guild_id, player in dirty.items():
+                if guild_id in resync:
+                    cleared.append(guild_id)
+                    self._persisted[guild_id] = set()
+                    for track in player.queue:
+                        track.queue_seq = None
+
+                persisted = self._persisted.get(guild_id, set())
+                current, rows = self._diff(guild_id, player, persisted)
+
+                if persisted - current:
+                    if current:
+                        removed.extend((guild_id, seq) for seq in persisted - current)
+                    elif guild_id not in resync:
+                        cleared.append(guild_id)
+
+                self._persisted[guild_id] = current
+                queue_rows.extend(rows)
+
+                track = player.current
+                if track is None and not current:
+                    idle.append(guild_id)
+                    continue
+
+                state_rows.append(dict(
+                    guild_id=guild_id,
+                    voice_channel_id=player.channel_id,
+                    track=track.track if track else None,
+                    requester=self._requester(track) if track else None,
+                    position=player.position if track else 0
+                ))
+
+            await self._write(cleared, removed, queue_rows, state_rows, idle)
+        except Exception as error:
+            for guild_id, player in dirty.items():
+                self._dirty.setdefault(guild_id, player)
+            self._resync |= resync | dirty.keys()
+
+            self.logger.warning(f'Failed to persist {len(dirty)} player queues: {error}')
+
+    def _diff(
+        self,
+        guild_id: int,
+        player: 'LavalinkPlayer',
+        persisted: Set[int]
+    ) -> Tuple[Set[int], List[dict]]:
+        first_seq, next_seq = self._seq_bounds.get(guild_id, (0, 0))
+
+        head = []
+        for track in player.queue:
+            if track.queue_seq in persisted:
+                break
+            head.append(track)
+        if len(head) == len(player.queue):
+            head = []
+
+        for i, track in enumerate(reversed(head), 1):
+            track.queue_seq = first_seq - i
+        first_seq -= len(head)
+
+        current: Set[int] = set()
+        rows: List[dict] = []
+        for track in player.queue:
+            seq = track.queue_seq
+            if seq is None:
+                seq = track.queue_seq = next_seq
+                next_seq += 1
+
+            if seq not in persisted:
+                rows.append(dict(
+                    guild_id=guild_id,
+                    seq=seq,
+                    track=track.track,
+                    requester=self._requester(track)
+                ))
+
+            current.add(seq)
+
+        self._seq_bounds[guild_id] = (first_seq, next_seq)
+
+        return current, rows
+
+    @staticmethod
+    def _requester(track) -> Optional[str]:
+        requester = track.requester
+        return str(requester) if requester else None
+
+    @staticmethod
+    async def _write(
+        cleared: List[int],
+        removed: List[Tuple[int, int]],
+        queue_rows: List[dict],
+        state_rows: List[dict],
+        idle: List[int]
+    ) -> None:
+        async with get_async_session() as session:
+            if cleared:
+                await session.execute(
+                    delete(QueueModel)
+                    .filter(QueueModel.guild_id.in_(cleared))
+                )
+            if removed:
+                await session.execute(
+                    delete(QueueModel)
+                    .filter(tuple_(QueueModel.guild_id, QueueModel.seq).in_(removed))
+                )
+            if queue_rows:
+                await session.execute(insert(QueueModel).values(queue_rows))
+            if idle:
+                await session.execute(
+                    delete(QueueStateModel)
+                    .filter(QueueStateModel.guild_id.in_(idle))
+                )
+            if state_rows:
+                query = insert(QueueStateModel).values(state_rows)
+                await session.execute(
+                    query.on_conflict_do_update(
+                        index_elements=[QueueStateModel.guild_id],
+                        set_=dict(
+                            voice_channel_id=query.excluded.voice_channel_id,
+                            track=query.excluded.track,
+                            requester=query.excluded.requester,
+                            position=query.excluded.position
+                        )
+                    )
+                )
+
+            await session.commit()
+
+
+queue_store = QueueStore(
+    env.PG_QUEUE_FLUSH_INTERVAL,
+    env.PG_QUEUE_CHECKPOINT_INTERVAL
+)
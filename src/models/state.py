@@ -0,0 +1,50 @@
+from typing import Optional
+
+from sqlalchemy import (
+    Text,
+    select,
+    func
+)
+from sqlalchemy.orm import (
+    Mapped,
+    mapped_column
+)
+from sqlalchemy.dialects.postgresql import insert
+
+from src.configs.postgres import get_async_session
+from src.models import BaseModel
+
+
+class StateModel(BaseModel):
+    __tablename__ = 'state'
+
+    key: Mapped[str] = mapped_column(Text, unique=True, nullable=False)
+    value: Mapped[str] = mapped_column(Text, nullable=False)
+
+    @classmethod
+    async def get(cls, key: str) -> Optional[str]:
+        async with get_async_session() as session:
+            query = (
+                select(cls.value)
+                .filter_by(key=key)
+            )
+
+            return (await session.execute(query)).scalar_one_or_none()
+
+    @classmethod
+    async def set(cls, key: str, value: str) -> None:
+        async with get_async_session() as session:
+            query = (
+                insert(cls)
+                .values(key=key, value=value)
+                .on_conflict_do_update(
+                    index_elements=[cls.key],
+                    set_=dict(
+                        value=value,
+                        updated=func.now()
+                    )
+                )
+            )
+
+            await session.execute(query)
+            await session.commit()
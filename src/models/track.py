@@ -0,0 +1,89 @@
+from typing import List, Optional
+from datetime import timedelta
+
+from sqlalchemy import (
+    Integer,
+    Text,
+    select,
+    delete,
+    func
+)
+from sqlalchemy.orm import (
+    Mapped,
+    mapped_column
+)
+from sqlalchemy.dialects.postgresql import insert, JSONB
+
+from src.configs.postgres import get_async_session
+from src.models import BaseModel
+
+
+class TrackCacheModel(BaseModel):
+    __tablename__ = 'track_cache'
+
+    query: Mapped[str] = mapped_column(Text, unique=True, nullable=False)
+
+    load_type: Mapped[str] = mapped_column(Text, nullable=False)
+    playlist_name: Mapped[str] = mapped_column(Text, nullable=True)
+    selected_track: Mapped[int] = mapped_column(Integer, nullable=False, default=-1)
+    tracks: Mapped[List[dict]] = mapped_column(JSONB, nullable=False)
+
+    @classmethod
+    async def add(
+        cls,
+        search_query: str,
+        load_type: str,
+        playlist_name: Optional[str],
+        selected_track: int,
+        tracks: List[dict]
+    ) -> None:
+        async with get_async_session() as session:
+            query = (
+                insert(cls)
+                .values(
+                    query=search_query,
+                    load_type=load_type,
+                    playlist_name=playlist_name,
+                    selected_track=selected_track,
+                    tracks=tracks
+                )
+                .on_conflict_do_update(
+                    index_elements=[cls.query],
+                    set_=dict(
+                        load_type=load_type,
+                        playlist_name=playlist_name,
+                        selected_track=selected_track,
+                        tracks=tracks,
+                        added=func.now()
+                    )
+                )
+            )
+
+            await session.execute(query)
+            await session.commit()
+
+    @classmethod
+    async def get(cls, search_query: str, max_age: timedelta) -> Optional['TrackCacheModel']:
+        async with get_async_session() as session:
+            query = (
+                select(cls)
+                .filter_by(query=search_query)
+                .filter(cls.added > func.now() - max_age)
+            )
+
+            track_cache_model = (await session.execute(query)).scalar_one_or_none()
+
+            return track_cache_model
+
+    @classmethod
+    async def prune_expired(cls, max_age: timedelta) -> int:
+        async with get_async_session() as session:
+            query = (
+                delete(cls)
+                .filter(cls.added <= func.now() - max_age)
+            )
+
+            result = await session.execute(query)
+            await session.commit()
+
+            return result.rowcount
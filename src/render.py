@@ -0,0 +1,140 @@
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import asyncio
+import json
+import logging
+import time
+
+import discord
+
+from src.configs.environment import get_environment_variables
+
+
+env = get_environment_variables()
+
+
+RenderKey = Tuple[int, str]
+
+
+class RenderScheduler:
+    def __init__(self, interval: float):
+        self.interval = interval
+
+        self.logger: Optional[logging.Logger] = None
+
+        self.scheduled = 0
+        self.rendered = 0
+
+        self._pending: Dict[RenderKey, Callable[[], Awaitable]] = {}
+        self._rendered_at: Dict[RenderKey, float] = {}
+        self._tasks: Dict[RenderKey, asyncio.Task] = {}
+
+    @property
+    def coalesced(self) -> int:
+        return self.scheduled - self.rendered - len(self._pending)
+
+    def schedule(self, guild_id: int, message: str, render: Callable[[], Awaitable]) -> None:
+        key = (guild_id, message)
+
+        self._pending[key] = render
+        self.scheduled += 1
+
+        if key not in self._tasks:
+            self._tasks[key] = asyncio.create_task(self._run(key))
+
+    def cancel(self, guild_id: int) -> None:
+        for key in [key for key in self._tasks if key[0] == guild_id]:
+            self._tasks.pop(key).cancel()
+            self._pending.pop(key, None)
+
+        for key in [key for key in self._rendered_at if key[0] == guild_id]:
+            del self._rendered_at[key]
+
+    async def close(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        self._pending.clear()
+        self._tasks.clear()
+
+    async def _run(self, key: RenderKey) -> None:
+        try:
+            while key in self._pending:
+                delay = self._rendered_at.get(key, 0.0) + self.interval - time.monotonic()
+                await asyncio.sleep(max(delay, 0))
+
+                render = self._pending.pop(key)
+                self._rendered_at[key] = time.monotonic()
+                self.rendered += 1
+
+                try:
+                    await render()
+                except Exception as error:
+                    if self.logger:
+                        self.logger.warning(f'Failed to render {key[1]} message of guild {key[0]}: {error}')
+        finally:
+            if self._tasks.get(key) is asyncio.current_task():
+                del self._tasks[key]
+
+
+class MessageFingerprints:
+    def __init__(self):
+        self.sent = 0
+        self.skipped = 0
+
+        self._fingerprints: Dict[int, Dict[int, int]] = {}
+
+    @staticmethod
+    def fingerprint(embed: discord.Embed, view: discord.ui.View) -> int:
+        return hash(json.dumps([embed.to_dict(), view.to_components()], sort_keys=True, default=str))
+
+    async def edit(
+        self,
+        guild_id: int,
+        message: discord.PartialMessage,
+        embed: discord.Embed,
+        view: discord.ui.View
+    ) -> bool:
+        fingerprint = self.fingerprint(embed, view)
+
+        fingerprints = self._fingerprints.setdefault(guild_id, {})
+        if fingerprints.get(message.id) == fingerprint:
+            self.skipped += 1
+            return False
+
+        try:
+            await message.edit(embed=embed, view=view)
+        except discord.HTTPException:
+            fingerprints.pop(message.id, None)
+            raise
+
+        fingerprints[message.id] = fingerprint
+        self.sent += 1
+
+        return True
+
+    def forget(self, guild_id: int) -> None:
+        self._fingerprints.pop(guild_id, None)
+
+
+class RateLimiter:
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0.0
+
+        self._next_slot = 0.0
+
+    async def acquire(self) -> None:
+        now = time.monotonic()
+
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+render_scheduler = RenderScheduler(env.BOT_RENDER_INTERVAL)
+message_fingerprints = MessageFingerprints()
@@ -0,0 +1,221 @@
+from typing import Dict, List, Optional, Set
+
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import lavalink
+
+from src.cache import LRUCache
+from src.configs.environment import get_environment_variables
+from src.models import TrackCacheModel
+
+
+env = get_environment_variables()
+
+
+IGNORED_URL_PARAMS = frozenset(('si', 'feature', 'pp'))
+IGNORED_URL_PARAM_PREFIXES = ('utm_',)
+
+
+class CachedLoadResult:
+    __slots__ = ('load_type', 'playlist_name', 'selected_track', 'tracks', 'expires')
+
+    def __init__(
+        self,
+        load_type: str,
+        playlist_name: Optional[str],
+        selected_track: int,
+        tracks: List[dict],
+        expires: float
+    ):
+        self.load_type = load_type
+        self.playlist_name = playlist_name
+        self.selected_track = selected_track
+        self.tracks = tracks
+        self.expires = expires
+
+    @classmethod
+    def from_load_result(cls, load_result: lavalink.LoadResult, expires: float) -> 'CachedLoadResult':
+        return cls(
+            load_result.load_type.value,
+            load_result.playlist_info.name or None,
+            load_result.playlist_info.selected_track,
+            [track.raw for track in load_result.tracks],
+            expires
+        )
+
+    def to_load_result(self) -> lavalink.LoadResult:
+        return lavalink.LoadResult(
+            lavalink.LoadType.from_str(self.load_type),
+            [lavalink.AudioTrack(track, 0) for track in self.tracks],
+            lavalink.PlaylistInfo(self.playlist_name or '', self.selected_track)
+        )
+
+
+class TrackSearch:
+    cacheable = (
+        lavalink.LoadType.TRACK,
+        lavalink.LoadType.PLAYLIST,
+        lavalink.LoadType.SEARCH
+    )
+    prune_every = 1000
+
+    def __init__(self, maxsize: int, ttl: float, persist: bool, persist_ttl: int):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.persist = persist
+        self.persist_ttl = timedelta(seconds=persist_ttl)
+
+        self.logger: Optional[logging.Logger] = None
+
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+        self._results: LRUCache[str, CachedLoadResult] = LRUCache(maxsize)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._writes = 0
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def hit_ratio(self) -> float:
+        requests = self.hits + self.persistent_hits + self.misses
+        return (self.hits + self.persistent_hits) / requests if requests else 0.0
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        query = query.strip()
+
+        url = urlsplit(query)
+        if url.scheme in ('http', 'https') and url.netloc:
+            params = [
+                (key, value)
+                for key, value in parse_qsl(url.query, keep_blank_values=True)
+                if key not in IGNORED_URL_PARAMS and not key.startswith(IGNORED_URL_PARAM_PREFIXES)
+            ]
+            return urlunsplit((
+                url.scheme.lower(),
+                url.netloc.lower(),
+                url.path,
+                urlencode(params),
+                ''
+            ))
+
+        return ' '.join(query.split()).lower()
+
+    def invalidate(self, query: Optional[str] = None) -> None:
+        self._results.invalidate(self.normalize(query) if query is not None else None)
+
+    async def get_tracks(self, node: lavalink.Node, query: str) -> lavalink.LoadResult:
+        key = self.normalize(query)
+
+        cached = self._get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached.to_load_result()
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return self._copy(await asyncio.shield(inflight))
+
+        inflight = self._inflight[key] = asyncio.create_task(self._load(node, key, query))
+        inflight.add_done_callback(lambda task: self._finish_load(key, task))
+
+        return await asyncio.shield(inflight)
+
+    async def _load(self, node: lavalink.Node, key: str, query: str) -> lavalink.LoadResult:
+        if self.persist:
+            cached = await self._get_persistent(key)
+            if cached is not None:
+                self.persistent_hits += 1
+                self._set(key, cached)
+                return cached.to_load_result()
+
+        self.misses += 1
+
+        load_result = await node.get_tracks(query)
+
+        if load_result.load_type in self.cacheable:
+            cached = CachedLoadResult.from_load_result(load_result, time.monotonic() + self.ttl)
+            self._set(key, cached)
+
+            if self.persist:
+                task = asyncio.create_task(self._set_persistent(key, cached))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+        return load_result
+
+    def _finish_load(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+        if not task.cancelled():
+            task.exception()
+
+    def _copy(self, load_result: lavalink.LoadResult) -> lavalink.LoadResult:
+        if load_result.load_type not in self.cacheable:
+            return load_result
+
+        return CachedLoadResult.from_load_result(load_result, 0.0).to_load_result()
+
+    def _get(self, key: str) -> Optional[CachedLoadResult]:
+        cached = self._results.lookup(key)
+        if cached is None:
+            return None
+
+        if cached.expires <= time.monotonic():
+            self._results.invalidate(key)
+            return None
+
+        return cached
+
+    def _set(self, key: str, cached: CachedLoadResult) -> None:
+        self._results.set(key, cached)
+
+    async def _get_persistent(self, key: str) -> Optional[CachedLoadResult]:
+        try:
+            track_cache_model = await TrackCacheModel.get(key, self.persist_ttl)
+        except Exception as error:
+            self.logger.warning(f'Failed to read cached tracks: {error}')
+            return None
+
+        if track_cache_model is None:
+            return None
+
+        return CachedLoadResult(
+            track_cache_model.load_type,
+            track_cache_model.playlist_name,
+            track_cache_model.selected_track,
+            track_cache_model.tracks,
+            time.monotonic() + self.ttl
+        )
+
+    async def _set_persistent(self, key: str, cached: CachedLoadResult) -> None:
+        try:
+            await TrackCacheModel.add(
+                key,
+                cached.load_type,
+                cached.playlist_name,
+                cached.selected_track,
+                cached.tracks
+            )
+
+            self._writes += 1
+            if self._writes % self.prune_every == 0:
+                await TrackCacheModel.prune_expired(self.persist_ttl)
+        except Exception as error:
+            self.logger.warning(f'Failed to cache tracks: {error}')
+
+
+track_search = TrackSearch(
+    env.LL_TRACK_CACHE_SIZE,
+    env.LL_TRACK_CACHE_TTL,
+    env.LL_TRACK_CACHE_PERSIST,
+    env.LL_TRACK_CACHE_PERSIST_TTL
+)
@@ -0,0 +1,17 @@
+import os
+import sys
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+for key, value in dict(
+    BOT_TOKEN='token',
+    PG_HOST='localhost',
+    PG_USER='user',
+    PG_PASSWORD='password',
+    PG_DB='db',
+    LL_HOST='localhost',
+    LL_PASSWORD='password',
+    LL_REGION='eu'
+).items():
+    os.environ.setdefault(key, value)
@@ -0,0 +1,81 @@
+import asyncio
+
+import lavalink
+
+from src.search import TrackSearch
+
+
+def test_normalize_strips_tracking_params():
+    assert TrackSearch.normalize(
+        'https://www.youtube.com/watch?v=abc&si=xyz&feature=share&pp=1&utm_source=x&utm_medium=y'
+    ) == 'https://www.youtube.com/watch?v=abc'
+
+
+def test_normalize_keeps_params_that_only_share_a_prefix():
+    assert TrackSearch.normalize(
+        'https://x.com/a?size=3&sig=abc&pp=1&v=q&single=1&features=2&ppid=4&siteid=5'
+    ) == 'https://x.com/a?size=3&sig=abc&v=q&single=1&features=2&ppid=4&siteid=5'
+
+
+class FakeNode:
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def get_tracks(self, query: str) -> lavalink.LoadResult:
+        self.calls += 1
+        await self.release.wait()
+
+        return lavalink.LoadResult(lavalink.LoadType.SEARCH, [])
+
+
+def make_track_search(persist: bool = False) -> TrackSearch:
+    track_search = TrackSearch(maxsize=10, ttl=60.0, persist=persist, persist_ttl=60)
+    track_search.reads = 0
+
+    async def get_persistent(key):
+        track_search.reads += 1
+        await asyncio.sleep(0)
+
+    track_search._get_persistent = get_persistent
+
+    return track_search
+
+
+def test_concurrent_lookups_load_once():
+    async def run():
+        track_search, node = make_track_search(persist=True), FakeNode()
+
+        lookups = [asyncio.create_task(track_search.get_tracks(node, 'query')) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        node.release.set()
+        await asyncio.gather(*lookups)
+
+        return track_search, node
+
+    track_search, node = asyncio.run(run())
+
+    assert track_search.reads == 1
+    assert node.calls == 1
+    assert track_search.coalesced == 2
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    async def run():
+        track_search, node = make_track_search(), FakeNode()
+
+        leader = asyncio.create_task(track_search.get_tracks(node, 'query'))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(track_search.get_tracks(node, 'query'))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        node.release.set()
+
+        return await follower, node
+
+    load_result, node = asyncio.run(run())
+
+    assert load_result.load_type == lavalink.LoadType.SEARCH
+    assert node.calls == 1